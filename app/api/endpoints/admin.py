@@ -0,0 +1,48 @@
+import time
+import logging
+
+from fastapi import APIRouter, HTTPException, Response
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.core.profiling import ProfilerBusy, profiler
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter()
+
+# Define request models
+class ProfileRequest(BaseModel):
+    requests: int = Field(10, description="Number of forward passes to profile", ge=1)
+    seconds: float = Field(30.0, description="Maximum capture duration in seconds", gt=0)
+
+@router.post("/profile", tags=["admin"])
+async def capture_profile(request: ProfileRequest) -> Response:
+    """
+    Profile the next N forward passes or T seconds, whichever comes first
+    
+    Returns a zip archive with torch.profiler Chrome traces, an operator
+    breakdown and sampled Python stacks in flamegraph folded format.
+    """
+    if request.requests > settings.PROFILE_MAX_REQUESTS or request.seconds > settings.PROFILE_MAX_SECONDS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Profile limits are {settings.PROFILE_MAX_REQUESTS} requests "
+                f"and {settings.PROFILE_MAX_SECONDS} seconds"
+            )
+        )
+    
+    try:
+        artifact = await profiler.capture(request.requests, request.seconds)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    filename = f"profile-{time.strftime('%Y%m%d-%H%M%S')}.zip"
+    return Response(
+        content=artifact,
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -0,0 +1,118 @@
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.bulk import (
+    ARROW_STREAM_MEDIA_TYPE,
+    BulkInputError,
+    extract_table,
+    read_ipc_stream,
+    require_pyarrow,
+    write_ipc_stream,
+)
+from app.models.memory import MemoryBudgetExceeded, memory_guard
+from app.models.ner_model import get_model
+from prometheus_client import Counter
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter()
+
+# Define bulk metrics
+bulk_request_counter = Counter('api_bulk_requests_total', 'Total bulk extraction requests', ['status'])
+
+async def read_body(request: Request, max_bytes: int) -> bytearray:
+    """
+    Read the request body, refusing bodies larger than ``max_bytes``
+    
+    Checks Content-Length up front, then caps the streamed read so a
+    missing or wrong header cannot make the worker buffer an unbounded body.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"Bulk request body exceeds {settings.BULK_MAX_BODY_MB}MB"
+    )
+    
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise too_large
+    
+    return body
+
+@router.post("/bulk/predict", tags=["prediction"])
+async def bulk_predict(
+    request: Request,
+    text_column: str = "text",
+    labels_column: Optional[str] = "labels",
+    entity_type: Optional[str] = None,
+    doc_id_column: Optional[str] = "doc_id",
+    model = Depends(get_model)
+) -> Response:
+    """
+    Extract entities from an Arrow IPC stream
+    
+    The request body is an Arrow IPC stream with a text column and an
+    optional labels column (a label or list of labels per row); rows
+    without labels use ``entity_type``. The response is an Arrow IPC
+    stream with one row per entity: doc_id, start, end, label, score.
+    Bodies over BULK_MAX_BODY_MB are rejected with 413.
+    """
+    try:
+        require_pyarrow()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    
+    try:
+        body = await read_body(request, settings.BULK_MAX_BODY_MB * 1024 * 1024)
+    except HTTPException:
+        bulk_request_counter.labels(status="too_large").inc()
+        raise
+    
+    try:
+        table = read_ipc_stream(body)
+        result = await run_in_threadpool(
+            extract_table,
+            model,
+            table,
+            text_column=text_column,
+            labels_column=labels_column,
+            entity_type=entity_type,
+            doc_id_column=doc_id_column
+        )
+        
+    except BulkInputError as e:
+        bulk_request_counter.labels(status="invalid").inc()
+        raise HTTPException(status_code=400, detail=str(e))
+        
+    except MemoryBudgetExceeded as e:
+        bulk_request_counter.labels(status="too_large").inc()
+        logger.warning(f"Rejected bulk request over memory budget: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+        
+    except Exception as e:
+        bulk_request_counter.labels(status="error").inc()
+        logger.error(f"Bulk prediction error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error during bulk prediction: {str(e)}"
+        )
+    
+    finally:
+        # Start draining this worker if memory has grown past the recycle threshold
+        memory_guard.check()
+    
+    bulk_request_counter.labels(status="success").inc()
+    logger.info(f"Bulk request of {table.num_rows} rows produced {result.num_rows} entities")
+    
+    return Response(content=write_ipc_stream(result), media_type=ARROW_STREAM_MEDIA_TYPE)
@@ -1,11 +1,16 @@
 import time
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, root_validator
 
+from app.core.config import settings
+from app.models.incremental import get_incremental_extractor
+from app.models.memory import MemoryBudgetExceeded, memory_guard
 from app.models.ner_model import get_model
+from app.models.single_flight import prediction_coalescer
+from starlette.concurrency import run_in_threadpool
 from prometheus_client import Counter, Histogram
 
 # Setup logging
@@ -23,7 +28,23 @@ request_size_histogram = Histogram('api_request_text_length', 'Distribution of r
 # Define request and response models
 class NERRequest(BaseModel):
     text: str = Field(..., description="Text to analyze for named entities", min_length=1)
-    entity_type: str = Field(..., description="The type of entity to extract", min_length=1)
+    entity_type: Optional[str] = Field(None, description="The type of entity to extract", min_length=1)
+    entity_types: List[str] = Field(default_factory=list, description="Several types of entity to extract in one request")
+    incremental: bool = Field(False, description="Only re-process sentences that changed since previous submissions")
+    
+    @root_validator(skip_on_failure=True)
+    def require_entity_type(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        if not values.get("entity_type") and not any(values.get("entity_types", [])):
+            raise ValueError("entity_type or entity_types is required")
+        return values
+    
+    @property
+    def labels(self) -> List[str]:
+        """
+        All requested entity types, deduplicated in request order
+        """
+        labels = ([self.entity_type] if self.entity_type else []) + self.entity_types
+        return list(dict.fromkeys(label for label in labels if label))
 
 class Entity(BaseModel):
     text: str = Field(..., description="The extracted entity text")
@@ -36,6 +57,60 @@ class NERResponse(BaseModel):
     entities: List[Entity] = Field(default_factory=list, description="List of extracted entities")
     processing_time: float = Field(..., description="Processing time in seconds")
 
+def predict_labels(predictor, text: str, entity_types: List[str]) -> List[Dict[str, Any]]:
+    """
+    Extract several entity types from one text
+    
+    Bi-encoder models score all labels in one pass over the text; other
+    models run one prediction per label.
+    """
+    if len(entity_types) == 1:
+        return predictor.predict(text, entity_types[0])
+    
+    if getattr(predictor, "bi_encoder", None) is not None:
+        return predictor.predict_labels(text, entity_types)
+    
+    return [
+        entity
+        for entity_type in entity_types
+        for entity in predictor.predict(text, entity_type)
+    ]
+
+async def run_prediction(
+    model,
+    text: str,
+    entity_types: List[str],
+    incremental: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Run a prediction off the event loop, sharing the result with identical
+    in-flight requests when coalescing is enabled
+    
+    Afterwards the worker starts draining if memory has grown past the
+    recycle threshold, for both HTTP and WebSocket traffic.
+    """
+    predictor = get_incremental_extractor(model) if incremental else model
+    
+    try:
+        if settings.COALESCING_ENABLED:
+            return await prediction_coalescer.run(
+                (text, tuple(entity_types), incremental),
+                predict_labels,
+                predictor,
+                text,
+                entity_types
+            )
+        
+        return await run_in_threadpool(
+            predict_labels,
+            predictor,
+            text,
+            entity_types
+        )
+    
+    finally:
+        memory_guard.check()
+
 @router.post("/predict", response_model=NERResponse, tags=["prediction"])
 async def predict_entities(
     request: NERRequest,
@@ -51,16 +126,19 @@ async def predict_entities(
         prediction_counter.inc()
         request_size_histogram.observe(len(request.text))
         
-        logger.info(f"Processing NER request for entity type: {request.entity_type}")
+        logger.info(f"Processing NER request for entity types: {request.labels}")
         
         # Run prediction
-        entities = model.predict(
-            text=request.text,
-            entity_type=request.entity_type
+        entities = await run_prediction(
+            model,
+            request.text,
+            request.labels,
+            incremental=request.incremental
         )
         
         # Record entity metrics
-        entity_counter.labels(entity_type=request.entity_type).inc(len(entities))
+        for entity in entities:
+            entity_counter.labels(entity_type=entity["entity_type"]).inc()
         
         # Calculate processing time
         processing_time = time.time() - start_time
@@ -73,6 +151,14 @@ async def predict_entities(
             processing_time=processing_time
         )
         
+    except MemoryBudgetExceeded as e:
+        prediction_error_counter.inc()
+        logger.warning(f"Rejected request over memory budget: {str(e)}")
+        raise HTTPException(
+            status_code=413,
+            detail=str(e)
+        )
+        
     except Exception as e:
         # Record error metrics
         prediction_error_counter.inc()
@@ -93,6 +179,13 @@ async def model_health_check(
     """
     Check if the model is loaded and ready for inference
     """
+    # Fail readiness while draining so traffic moves off before the recycle
+    if memory_guard.draining:
+        raise HTTPException(
+            status_code=503,
+            detail="Worker is draining before a memory recycle"
+        )
+    
     return {
         "status": "healthy",
         "model_name": model.model_name,
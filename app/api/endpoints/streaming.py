@@ -0,0 +1,151 @@
+import json
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional, Set
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+from pydantic import Field, ValidationError
+from starlette.concurrency import run_in_threadpool
+from starlette.websockets import WebSocketState
+
+from app.api.endpoints.prediction import NERRequest, run_prediction
+from app.core.config import settings
+from app.core.security import verify_websocket_api_key
+from app.models.memory import memory_guard
+from app.models.ner_model import get_model
+from prometheus_client import Counter, Gauge
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Create router
+router = APIRouter()
+
+# Define streaming metrics
+ws_connections_gauge = Gauge('api_ws_connections', 'Open WebSocket prediction connections')
+ws_messages_counter = Counter('api_ws_predictions_total', 'WebSocket prediction messages', ['status'])
+
+# Define streaming request model
+class StreamRequest(NERRequest):
+    id: str = Field(..., description="Client-assigned request ID echoed in the response", min_length=1)
+
+@router.websocket("/ws/predict")
+async def stream_predictions(websocket: WebSocket) -> None:
+    """
+    Extract named entities from a stream of requests over one connection
+    
+    Clients authenticate once on the handshake, then send JSON messages of
+    the form ``{"id": ..., "text": ..., "entity_type": ...}`` (or
+    ``"entity_types": [...]``). Results are
+    sent back as they complete, possibly out of order, tagged with the
+    request ID. At most WS_MAX_INFLIGHT requests per connection are
+    processed at once; further messages are not read until one finishes.
+    
+    While the worker drains before a memory recycle, new connections are
+    refused and open ones are closed with 1012 once their in-flight
+    requests finish, so clients reconnect to another worker.
+    """
+    if not verify_websocket_api_key(websocket):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    if memory_guard.draining:
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+    
+    await websocket.accept()
+    ws_connections_gauge.inc()
+    
+    inflight = asyncio.Semaphore(settings.WS_MAX_INFLIGHT)
+    send_lock = asyncio.Lock()
+    tasks: Set[asyncio.Task] = set()
+    draining = asyncio.Event()
+    
+    async def send(message: Dict[str, Any]) -> None:
+        async with send_lock:
+            if websocket.application_state == WebSocketState.CONNECTED:
+                await websocket.send_json(message)
+    
+    async def close_when_draining() -> None:
+        await draining.wait()
+        if tasks:
+            await asyncio.wait(set(tasks), timeout=memory_guard.drain_seconds)
+        async with send_lock:
+            logger.info("Closing WebSocket connection while worker drains")
+            await websocket.close(code=status.WS_1012_SERVICE_RESTART)
+    
+    async def handle(request: StreamRequest) -> None:
+        start_time = time.time()
+        try:
+            entities = await run_prediction(
+                model,
+                request.text,
+                request.labels,
+                incremental=request.incremental
+            )
+            ws_messages_counter.labels(status="success").inc()
+            await send({
+                "id": request.id,
+                "entities": entities,
+                "processing_time": time.time() - start_time
+            })
+        except WebSocketDisconnect:
+            pass
+        except Exception as e:
+            ws_messages_counter.labels(status="error").inc()
+            logger.error(f"Streaming prediction error: {str(e)}")
+            try:
+                await send({"id": request.id, "error": f"Error during prediction: {str(e)}"})
+            except WebSocketDisconnect:
+                pass
+        finally:
+            inflight.release()
+    
+    memory_guard.add_drain_callback(draining.set)
+    closer = asyncio.create_task(close_when_draining())
+    
+    try:
+        model = await run_in_threadpool(get_model)
+        
+        while True:
+            # Stop reading from the socket while the connection is at its limit
+            await inflight.acquire()
+            text = await websocket.receive_text()
+            message: Any = None
+            
+            try:
+                message = json.loads(text)
+                request = StreamRequest.parse_obj(message)
+            except (ValueError, ValidationError) as e:
+                # One malformed frame must not tear down the other requests in flight
+                inflight.release()
+                ws_messages_counter.labels(status="invalid").inc()
+                request_id: Optional[Any] = message.get("id") if isinstance(message, dict) else None
+                error = e.errors() if isinstance(e, ValidationError) else f"Invalid JSON: {str(e)}"
+                await send({"id": request_id, "error": error})
+                continue
+            
+            if draining.is_set():
+                inflight.release()
+                await send({"id": request.id, "error": "Worker is draining before a memory recycle, reconnect and retry"})
+                continue
+            
+            task = asyncio.create_task(handle(request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    
+    except WebSocketDisconnect:
+        logger.info("WebSocket client disconnected")
+    
+    except Exception as e:
+        logger.error(f"WebSocket connection error: {str(e)}")
+        if websocket.application_state == WebSocketState.CONNECTED:
+            await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+    
+    finally:
+        memory_guard.remove_drain_callback(draining.set)
+        closer.cancel()
+        for task in tasks:
+            task.cancel()
+        ws_connections_gauge.dec()
@@ -0,0 +1,85 @@
+"""
+Command line bulk extraction over Arrow and Parquet files.
+
+Usage:
+    python -m app.cli extract --input docs.parquet --output entities.arrow --entity-type person
+"""
+import sys
+import argparse
+import logging
+
+from app.core.logging_config import setup_logging
+from app.models.bulk import extract_table, require_pyarrow
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+def _read_table(path: str):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+
+    with pa.memory_map(path) as source:
+        try:
+            return pa.ipc.open_file(source).read_all()
+        except pa.ArrowInvalid:
+            source.seek(0)
+            return pa.ipc.open_stream(source).read_all()
+
+
+def _write_table(table, path: str) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if path.endswith(".parquet"):
+        pq.write_table(table, path)
+        return
+
+    with pa.OSFile(path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="GLiNER bulk entity extraction")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    extract = subparsers.add_parser("extract", help="Extract entities from an Arrow or Parquet table")
+    extract.add_argument("--input", required=True, help="Input .arrow/.feather (IPC) or .parquet file")
+    extract.add_argument("--output", required=True, help="Output .arrow (IPC file) or .parquet file")
+    extract.add_argument("--text-column", default="text")
+    extract.add_argument("--labels-column", default="labels")
+    extract.add_argument("--doc-id-column", default="doc_id")
+    extract.add_argument("--entity-type", default=None, help="Label for rows without a labels value")
+
+    args = parser.parse_args(argv)
+    setup_logging()
+
+    try:
+        require_pyarrow()
+    except RuntimeError as e:
+        logger.error(str(e))
+        return 1
+
+    from app.models.ner_model import get_model
+
+    table = _read_table(args.input)
+    result = extract_table(
+        get_model(),
+        table,
+        text_column=args.text_column,
+        labels_column=args.labels_column,
+        entity_type=args.entity_type,
+        doc_id_column=args.doc_id_column
+    )
+    _write_table(result, args.output)
+
+    logger.info(f"Wrote {result.num_rows} entities for {table.num_rows} rows to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
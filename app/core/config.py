@@ -22,9 +22,56 @@ class Settings(BaseSettings):
     MODEL_NAME: str = "urchade/gliner_medium-v2.1"
     MODEL_CACHE_DIR: Optional[str] = None
     
+    # Torch execution settings
+    TORCH_EXECUTION_MODE: str = "eager"  # "eager", "compile", "torchscript"
+    TORCH_NUM_THREADS: Optional[int] = None  # Defaults to the cgroup CPU quota
+    TORCH_INTEROP_THREADS: Optional[int] = None  # Defaults to 1
+    SEQUENCE_LENGTH_BUCKETS: List[int] = [32, 64, 128, 256, 512]
+    PARITY_ATOL: float = 1e-3
+    
+    # Cascade routing settings
+    CASCADE_ENABLED: bool = False
+    CASCADE_SMALL_MODEL_NAME: str = "urchade/gliner_small-v2.1"
+    CASCADE_CONFIDENCE_MARGIN: float = 0.8  # Min score to accept small-model spans
+    CASCADE_CHUNK_SIZE: int = 0  # Characters per routing chunk, 0 routes whole requests
+    CASCADE_ESCALATE_EMPTY: bool = False
+    
+    # Bi-encoder settings
+    BI_ENCODER_ENABLED: bool = False  # MODEL_NAME must be a bi-encoder GLiNER checkpoint
+    BI_ENCODER_THRESHOLD: float = 0.5  # Min span probability from the model's span scorer
+    LABEL_VOCABULARY: List[str] = []  # Labels to precompute and persist embeddings for at load time
+    LABEL_CACHE_MAX_EXTRA: int = 1024  # Max other label embeddings kept in memory (LRU)
+    
+    # Request coalescing settings
+    COALESCING_ENABLED: bool = True  # Share results between identical in-flight requests
+    
+    # WebSocket streaming settings
+    WS_MAX_INFLIGHT: int = 32  # Max concurrent requests per connection
+    
+    # Incremental extraction settings
+    INCREMENTAL_CACHE_SIZE: int = 10000  # Max cached document segments
+    
+    # Memory guardrail settings
+    MEMORY_BYTES_PER_TOKEN: int = 512 * 1024  # Projected activation memory per token
+    MEMORY_REQUEST_BUDGET_MB: Optional[int] = 1024  # Max projected memory per forward pass
+    MEMORY_SPLIT_OVERSIZED: bool = True  # Split over-budget requests instead of rejecting
+    MEMORY_RECYCLE_THRESHOLD_MB: Optional[int] = 3400  # RSS at which the worker drains and restarts
+    MEMORY_DRAIN_SECONDS: float = 45.0  # Time to leave rotation before restarting
+    
+    # Bulk extraction settings
+    BULK_BATCH_SIZE: int = 16  # Texts per batched forward pass
+    BULK_MAX_ROWS: int = 100000  # Max (text, label) pairs per bulk request
+    BULK_MAX_BODY_MB: int = 256  # Max Arrow IPC request body size
+    
+    # Profiling settings
+    PROFILE_MAX_REQUESTS: int = 50  # Max forward passes captured per session
+    PROFILE_MAX_SECONDS: float = 60.0  # Max duration of a session
+    PROFILE_SAMPLE_INTERVAL_MS: int = 10  # Python stack sampling interval, at least 5ms
+    
     # Security settings
     API_KEY_ENABLED: bool = True
     API_KEY: str = os.getenv("API_KEY", secrets.token_urlsafe(32))
+    ADMIN_API_KEY: Optional[str] = None  # Admin endpoints are disabled unless set
     
     # CORS settings
     CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -37,6 +84,12 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
+    @validator("TORCH_EXECUTION_MODE")
+    def validate_execution_mode(cls, v: str) -> str:
+        if v not in ("eager", "compile", "torchscript"):
+            raise ValueError(f"Unsupported TORCH_EXECUTION_MODE: {v}")
+        return v
+    
     # Logging settings
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"  # "json" or "text"
@@ -63,6 +116,7 @@ class Settings(BaseSettings):
     
     # Metrics settings
     METRICS_ENABLED: bool = True
+    OTEL_METRICS_ENABLED: bool = False  # Imports the OpenTelemetry SDK at startup when set
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,113 @@
+import time
+import logging
+import importlib
+import importlib.util
+import threading
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Dict, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing each lazily loaded module, in load order
+lazy_import_times: Dict[str, float] = {}
+
+# Seconds spent importing each subsystem of the app at startup, in import order
+startup_import_times: Dict[str, float] = {}
+
+_import_lock = threading.Lock()
+
+
+class LazyModule:
+    """
+    Proxy that imports a module on first attribute access
+
+    Lets heavy dependencies (torch, transformers, pyarrow) stay out of the
+    app import path until a code path that needs them actually runs.
+    """
+    def __init__(self, name: str):
+        self._name = name
+        self._module: Optional[ModuleType] = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with _import_lock:
+                if self._module is None:
+                    start_time = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    elapsed = time.perf_counter() - start_time
+                    lazy_import_times.setdefault(self._name, elapsed)
+                    logger.info(f"Lazily imported {self._name} in {elapsed:.2f} seconds")
+                    self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """
+    Get a lazy proxy for a module
+
+    Args:
+        name: Fully qualified module name, e.g. "torch"
+
+    Returns:
+        Proxy importing the module on first attribute access
+    """
+    return LazyModule(name)
+
+
+def optional_import(name: str) -> Optional[LazyModule]:
+    """
+    Get a lazy proxy for an optional dependency, or None if it is not installed
+
+    Only checks that the module can be found; it is not imported until used.
+    """
+    try:
+        if importlib.util.find_spec(name) is None:
+            return None
+    except (ImportError, ValueError):
+        return None
+    return LazyModule(name)
+
+
+@contextmanager
+def timed_import(name: str):
+    """
+    Record how long the imports in the enclosed block take
+
+    Modules shared with earlier blocks are already cached, so each entry is
+    the cost that subsystem adds to startup.
+
+    Args:
+        name: Subsystem name shown in the import time report
+    """
+    start_time = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_import_times[name] = startup_import_times.get(name, 0.0) + time.perf_counter() - start_time
+
+
+def import_time_report(app_import_seconds: float) -> Dict[str, object]:
+    """
+    Summarize where startup import time went
+
+    Args:
+        app_import_seconds: Time taken to import the app module
+
+    Returns:
+        App import time, its breakdown by subsystem, and the lazy modules
+        loaded so far with their import times
+    """
+    return {
+        "app_import_seconds": round(app_import_seconds, 3),
+        "subsystems": {name: round(seconds, 3) for name, seconds in startup_import_times.items()},
+        "lazy_imports": {name: round(seconds, 3) for name, seconds in lazy_import_times.items()},
+    }
@@ -0,0 +1,271 @@
+import io
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+import zipfile
+from collections import Counter as StackCounter
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from prometheus_client import Counter
+
+# torch is imported on first use to keep app startup fast
+torch = lazy_import("torch")
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for on-demand profiling
+profile_sessions_counter = Counter('profiling_sessions_total', 'On-demand profiling sessions captured')
+profiled_forwards_counter = Counter('profiling_forward_passes_total', 'Forward passes captured with torch.profiler')
+
+
+class ProfilerBusy(RuntimeError):
+    """
+    Raised when a profiling session is already running
+    """
+
+
+class ProfileSession:
+    """
+    A bounded profiling capture
+
+    Collects torch.profiler traces for up to ``max_requests`` forward passes
+    and samples Python stacks of all threads until the request budget is
+    used up or ``max_seconds`` elapse, whichever comes first.
+    """
+    def __init__(self, max_requests: int, max_seconds: float, sample_interval: float):
+        self.max_requests = max_requests
+        self.max_seconds = max_seconds
+        self.sample_interval = sample_interval
+        self.started_at = time.monotonic()
+        self.deadline = self.started_at + max_seconds
+
+        self.claimed_requests = 0
+        # Finished torch profilers, exported only when the artifact is built
+        self.profiles: List[Any] = []
+        self.traces: List[bytes] = []
+        self.operator_stats: Dict[str, Dict[str, float]] = {}
+        self.stack_counts: StackCounter = StackCounter()
+        self.sample_count = 0
+
+        self.done = threading.Event()
+        self._stop_sampling = threading.Event()
+        self._lock = threading.Lock()
+        self._sampler = threading.Thread(target=self._sample_stacks, name="profile-sampler", daemon=True)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop_sampling.set()
+        self._sampler.join(timeout=1)
+        self.done.set()
+
+    def claim_request(self) -> bool:
+        """
+        Reserve one forward pass of the request budget
+
+        Returns:
+            True if this forward pass should be profiled
+        """
+        with self._lock:
+            if self.done.is_set() or self.expired or self.claimed_requests >= self.max_requests:
+                return False
+            self.claimed_requests += 1
+            return True
+
+    def add_forward(self, prof) -> None:
+        """
+        Keep one profiled forward pass for the artifact
+
+        Only stores the finished profiler; exporting its trace happens when
+        the artifact is built, so it never adds to the request's latency.
+        """
+        with self._lock:
+            self.profiles.append(prof)
+            if len(self.profiles) >= self.max_requests:
+                self.done.set()
+
+        profiled_forwards_counter.inc()
+
+    def _record_profile(self, prof) -> None:
+        """
+        Export the trace and operator breakdown of one profiled forward pass
+        """
+        # export_chrome_trace only writes to a path
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            prof.export_chrome_trace(path)
+            with open(path, "rb") as f:
+                self.traces.append(f.read())
+        finally:
+            os.remove(path)
+
+        for event in prof.key_averages():
+            stats = self.operator_stats.setdefault(
+                event.key, {"count": 0, "self_cpu_us": 0.0, "cpu_total_us": 0.0}
+            )
+            stats["count"] += event.count
+            stats["self_cpu_us"] += event.self_cpu_time_total
+            stats["cpu_total_us"] += event.cpu_time_total
+
+    def _sample_stacks(self) -> None:
+        """
+        Periodically record the Python stack of every other thread
+        """
+        own_thread = threading.get_ident()
+
+        while not self._stop_sampling.wait(self.sample_interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+
+                self.stack_counts[";".join(reversed(stack))] += 1
+
+            self.sample_count += 1
+
+    def build_artifact(self) -> bytes:
+        """
+        Package the capture as a zip archive
+
+        Contains one Chrome trace per forward pass (open in chrome://tracing
+        or Perfetto), Python stacks in folded format for flamegraph tools,
+        an operator breakdown table, and a summary. Blocking; run it off the
+        event loop.
+        """
+        for prof in self.profiles:
+            self._record_profile(prof)
+        self.profiles = []
+
+        summary = {
+            "duration_seconds": round(time.monotonic() - self.started_at, 3),
+            "profiled_forward_passes": len(self.traces),
+            "python_stack_samples": self.sample_count,
+            "sample_interval_seconds": self.sample_interval,
+        }
+
+        operators = sorted(self.operator_stats.items(), key=lambda item: item[1]["self_cpu_us"], reverse=True)
+        operator_lines = [f"{'operator':<60} {'count':>8} {'self_cpu_ms':>12} {'cpu_total_ms':>12}"]
+        for name, stats in operators:
+            operator_lines.append(
+                f"{name[:60]:<60} {stats['count']:>8} "
+                f"{stats['self_cpu_us'] / 1000:>12.3f} {stats['cpu_total_us'] / 1000:>12.3f}"
+            )
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr("summary.json", json.dumps(summary, indent=2))
+            archive.writestr("operators.txt", "\n".join(operator_lines) + "\n")
+            archive.writestr(
+                "python_stacks.folded",
+                "".join(f"{stack} {count}\n" for stack, count in self.stack_counts.most_common())
+            )
+            for index, trace in enumerate(self.traces):
+                archive.writestr(f"torch/forward_{index:03d}.json", trace)
+
+        return buffer.getvalue()
+
+
+class Profiler:
+    """
+    Runs at most one profiling session at a time for this worker
+    """
+    def __init__(self):
+        self.session: Optional[ProfileSession] = None
+        self._start_lock = threading.Lock()
+        # torch.profiler cannot capture overlapping forward passes
+        self._forward_lock = threading.Lock()
+
+    @contextmanager
+    def profile_forward(self):
+        """
+        Profile the enclosed forward pass if a session wants it
+
+        Concurrent forward passes are left unprofiled rather than waiting,
+        so profiling never serializes inference.
+        """
+        session = self.session
+        if session is None or not self._forward_lock.acquire(blocking=False):
+            yield
+            return
+
+        try:
+            if not session.claim_request():
+                yield
+                return
+
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+
+            with torch.profiler.profile(activities=activities) as prof:
+                yield
+            session.add_forward(prof)
+
+        finally:
+            self._forward_lock.release()
+
+    def _finish(self, session: ProfileSession) -> None:
+        # Wait for a forward pass still being profiled to record its trace
+        with self._forward_lock:
+            session.stop()
+
+    async def capture(self, max_requests: int, max_seconds: float) -> bytes:
+        """
+        Profile the next ``max_requests`` forward passes or ``max_seconds``
+
+        Raises:
+            ProfilerBusy: If another session is already running
+
+        Returns:
+            Zip archive with the captured profile
+        """
+        with self._start_lock:
+            if self.session is not None:
+                raise ProfilerBusy("A profiling session is already running")
+            session = ProfileSession(
+                max_requests,
+                max_seconds,
+                max(settings.PROFILE_SAMPLE_INTERVAL_MS, 5) / 1000
+            )
+            self.session = session
+
+        logger.info(f"Starting profiling session: {max_requests} requests or {max_seconds}s")
+        session.start()
+
+        loop = asyncio.get_running_loop()
+
+        try:
+            while not session.done.is_set() and not session.expired:
+                await asyncio.sleep(0.1)
+        finally:
+            self.session = None
+            await loop.run_in_executor(None, self._finish, session)
+
+        profile_sessions_counter.inc()
+        logger.info(f"Profiling session captured {len(session.profiles)} forward passes")
+        # Trace export and compression are CPU-heavy, keep them off the event loop
+        return await loop.run_in_executor(None, session.build_artifact)
+
+
+# Global profiler for this worker
+profiler = Profiler()
@@ -1,7 +1,7 @@
 import logging
 from typing import Optional
 
-from fastapi import Depends, HTTPException, status, Security
+from fastapi import Depends, HTTPException, status, Security, WebSocket
 from fastapi.security.api_key import APIKeyHeader, APIKeyCookie, APIKeyQuery
 from starlette.status import HTTP_403_FORBIDDEN
 
@@ -52,4 +52,70 @@ async def verify_api_key(
             headers={"WWW-Authenticate": f"APIKey {API_KEY_NAME}"},
         )
         
-    return True
\ No newline at end of file
+    return True
+
+async def verify_admin_api_key(
+    api_key_header: Optional[str] = Security(api_key_header),
+    api_key_query: Optional[str] = Security(api_key_query),
+    api_key_cookie: Optional[str] = Security(api_key_cookie),
+) -> bool:
+    """
+    Verify the admin API key from header, query param, or cookie
+    
+    Admin endpoints are disabled unless ADMIN_API_KEY is set.
+    
+    Returns:
+        bool: True if the admin API key is valid
+        
+    Raises:
+        HTTPException: If admin endpoints are disabled or the key is invalid
+    """
+    if not settings.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled",
+        )
+    
+    api_key = api_key_header or api_key_query or api_key_cookie
+    
+    if not api_key:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="API key missing",
+            headers={"WWW-Authenticate": f"APIKey {API_KEY_NAME}"},
+        )
+    
+    if api_key != settings.ADMIN_API_KEY:
+        logger.warning("Invalid admin API key attempt")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid API key",
+            headers={"WWW-Authenticate": f"APIKey {API_KEY_NAME}"},
+        )
+    
+    return True
+
+def verify_websocket_api_key(websocket: WebSocket) -> bool:
+    """
+    Verify the API key for a WebSocket connection
+    
+    The HTTP security schemes above only work on regular requests, so the
+    key is read from the handshake header, query param, or cookie directly.
+    
+    Returns:
+        bool: True if API key is valid or authentication is disabled
+    """
+    if not settings.API_KEY_ENABLED:
+        return True
+    
+    api_key = (
+        websocket.headers.get(API_KEY_NAME)
+        or websocket.query_params.get(API_KEY_NAME)
+        or websocket.cookies.get(API_KEY_NAME)
+    )
+    
+    if api_key != settings.API_KEY:
+        logger.warning("Invalid WebSocket API key attempt")
+        return False
+    
+    return True
@@ -0,0 +1,36 @@
+import logging
+
+from app.core.config import settings
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# OpenTelemetry meter, set by setup_opentelemetry
+meter = None
+
+
+def setup_opentelemetry():
+    """
+    Initialize OpenTelemetry metrics with a Prometheus reader
+
+    The SDK and exporter are only imported here, so they stay off the app
+    import path unless OTEL_METRICS_ENABLED is set.
+
+    Returns:
+        Meter for the service, or None if disabled
+    """
+    global meter
+    if not settings.OTEL_METRICS_ENABLED or meter is not None:
+        return meter
+
+    from opentelemetry import metrics
+    from opentelemetry.sdk.metrics import MeterProvider
+    from opentelemetry.exporter.prometheus import PrometheusMetricReader
+
+    reader = PrometheusMetricReader()
+    provider = MeterProvider(metric_readers=[reader])
+    metrics.set_meter_provider(provider)
+    meter = metrics.get_meter("gliner.metrics")
+
+    logger.info("OpenTelemetry metrics initialized")
+    return meter
@@ -1,17 +1,33 @@
 import time
-from fastapi import FastAPI, Request, Depends
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
-from opentelemetry import metrics
-from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.export import PeriodicExportingMetricReader
-from opentelemetry.exporter.prometheus import PrometheusMetricReader
-
-from app.api.endpoints import prediction
-from app.core.config import settings
-from app.core.logging_config import setup_logging
-from app.core.security import verify_api_key
+
+# Measure app import time for the startup report
+_import_start_time = time.perf_counter()
+
+from app.core.lazy import import_time_report, timed_import
+
+with timed_import("fastapi"):
+    from fastapi import FastAPI, Request, Depends, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+
+with timed_import("prometheus_client"):
+    from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+
+with timed_import("app.core"):
+    from app.core.config import settings
+    from app.core.logging_config import setup_logging
+    from app.core.security import verify_admin_api_key, verify_api_key
+    from app.core.telemetry import setup_opentelemetry
+
+# Routers, in dependency order; prediction also pulls in the model stack
+with timed_import("app.api.endpoints.prediction"):
+    from app.api.endpoints import prediction
+with timed_import("app.api.endpoints.streaming"):
+    from app.api.endpoints import streaming
+with timed_import("app.api.endpoints.bulk"):
+    from app.api.endpoints import bulk
+with timed_import("app.api.endpoints.admin"):
+    from app.api.endpoints import admin
 
 # Setup logging
 logger = setup_logging()
@@ -22,11 +38,7 @@ request_latency = Histogram('http_request_duration_seconds', 'HTTP Request Laten
 prediction_counter = Counter('model_predictions_total', 'Total Model Predictions')
 prediction_latency = Histogram('model_prediction_duration_seconds', 'Model Prediction Latency')
 
-# Initialize OpenTelemetry metrics
-reader = PrometheusMetricReader()
-provider = MeterProvider(metric_readers=[reader])
-metrics.set_meter_provider(provider)
-meter = metrics.get_meter("gliner.metrics")
+app_import_gauge = Gauge('app_import_seconds', 'Time taken to import the app module')
 
 # Create FastAPI app
 app = FastAPI(
@@ -84,6 +96,25 @@ app.include_router(
     dependencies=[Depends(verify_api_key)] if settings.API_KEY_ENABLED else None
 )
 
+app.include_router(
+    bulk.router,
+    prefix="/api/v1",
+    dependencies=[Depends(verify_api_key)] if settings.API_KEY_ENABLED else None
+)
+
+# Admin routes always require the separate admin API key
+app.include_router(
+    admin.router,
+    prefix="/api/v1/admin",
+    dependencies=[Depends(verify_admin_api_key)]
+)
+
+# WebSocket routes authenticate on the handshake themselves
+app.include_router(
+    streaming.router,
+    prefix="/api/v1"
+)
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -98,12 +129,19 @@ async def metrics():
 @app.on_event("startup")
 async def startup_event():
     logger.info(f"Starting {settings.PROJECT_NAME} API server")
+    logger.info(f"Import time report: {import_time_report(_app_import_seconds)}")
+    
+    # Optional subsystems are only imported when configured
+    setup_opentelemetry()
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"Shutting down {settings.PROJECT_NAME} API server")
 
+_app_import_seconds = time.perf_counter() - _import_start_time
+app_import_gauge.set(_app_import_seconds)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=settings.PORT, reload=settings.DEBUG)  
\ No newline at end of file
@@ -0,0 +1,250 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.lazy import lazy_import, optional_import
+from prometheus_client import Counter
+
+# Optional dependency, imported on first use
+pa = optional_import("pyarrow")
+# find_spec on a submodule imports its parent, so only proxy it here
+pc = lazy_import("pyarrow.compute") if pa is not None else None
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for bulk extraction
+bulk_rows_counter = Counter('model_bulk_pairs_total', 'Text/label pairs processed by bulk extraction')
+
+# Media type for Arrow IPC streams
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+
+class BulkInputError(ValueError):
+    """
+    Raised when a bulk input table is malformed or too large
+    """
+
+
+def require_pyarrow() -> None:
+    """
+    Fail clearly if the optional pyarrow dependency is missing
+    """
+    if pa is None:
+        raise RuntimeError("Bulk extraction requires pyarrow to be installed")
+
+
+def entities_schema(doc_id_type=None):
+    """
+    Schema of the bulk extraction output
+
+    Only flat primitive columns (plus a dictionary-encoded label) so the
+    result maps directly onto numpy/pandas buffers without copying.
+    """
+    require_pyarrow()
+    return pa.schema([
+        pa.field("doc_id", doc_id_type or pa.int64()),
+        pa.field("start", pa.int32()),
+        pa.field("end", pa.int32()),
+        pa.field("label", pa.dictionary(pa.int32(), pa.string())),
+        pa.field("score", pa.float32()),
+    ])
+
+
+def read_ipc_stream(data: bytes):
+    """
+    Read an Arrow IPC stream into a table
+    """
+    require_pyarrow()
+    try:
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+    except pa.ArrowInvalid as e:
+        raise BulkInputError(f"Invalid Arrow IPC stream: {e}")
+
+
+def write_ipc_stream(table) -> bytes:
+    """
+    Serialize a table as an Arrow IPC stream
+    """
+    require_pyarrow()
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def is_string_type(arrow_type) -> bool:
+    """
+    Whether an Arrow type holds strings, including dictionary-encoded and view strings
+    """
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    return (
+        pa.types.is_string(arrow_type)
+        or pa.types.is_large_string(arrow_type)
+        or (hasattr(pa.types, "is_string_view") and pa.types.is_string_view(arrow_type))
+    )
+
+
+def is_list_type(arrow_type) -> bool:
+    """
+    Whether an Arrow type is a list or large list
+    """
+    return pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type)
+
+
+def text_column_values(table, text_column: str):
+    """
+    Get the text column as plain large strings
+
+    Dictionary-encoded (e.g. pandas categoricals) and string view columns
+    are decoded so compute kernels and to_pylist see one string type.
+
+    Raises:
+        BulkInputError: If the column is missing or does not hold strings
+    """
+    if text_column not in table.column_names:
+        raise BulkInputError(f"Missing text column: {text_column}")
+
+    texts = table.column(text_column)
+    if not is_string_type(texts.type):
+        raise BulkInputError(f"Text column {text_column} must hold strings, got {texts.type}")
+    return texts.cast(pa.large_string())
+
+
+def labels_column_values(table, labels_column: Optional[str]):
+    """
+    Get the labels column, or None if there is none
+
+    Raises:
+        BulkInputError: If the column holds neither strings nor lists of strings
+    """
+    if not labels_column or labels_column not in table.column_names:
+        return None
+
+    labels = table.column(labels_column)
+    label_type = labels.type.value_type if is_list_type(labels.type) else labels.type
+    if not (pa.types.is_null(label_type) or is_string_type(label_type)):
+        raise BulkInputError(
+            f"Labels column {labels_column} must hold strings or lists of strings, got {labels.type}"
+        )
+    return labels
+
+
+def count_pairs(texts, labels, entity_type: Optional[str]) -> int:
+    """
+    Count the (text, label) pairs a table expands to, without converting it to Python
+
+    Rows with an empty text are skipped; rows without labels count once if
+    an ``entity_type`` is given.
+
+    Args:
+        texts: Text column from text_column_values
+        labels: Labels column from labels_column_values, or None
+        entity_type: Label applied to rows without labels
+    """
+    require_pyarrow()
+
+    default_labels = 1 if entity_type else 0
+    has_text = pc.fill_null(pc.greater(pc.utf8_length(texts), 0), False)
+
+    if labels is None:
+        per_row = pa.array([default_labels] * len(texts), type=pa.int64())
+    elif is_list_type(labels.type):
+        per_row = pc.fill_null(pc.list_value_length(labels), default_labels)
+    else:
+        per_row = pc.if_else(pc.is_valid(labels), 1, default_labels)
+
+    return pc.sum(pc.if_else(has_text, per_row, 0)).as_py() or 0
+
+
+def extract_table(
+    model,
+    table,
+    text_column: str = "text",
+    labels_column: Optional[str] = "labels",
+    entity_type: Optional[str] = None,
+    doc_id_column: Optional[str] = "doc_id"
+):
+    """
+    Extract entities for every row of an Arrow table
+
+    Args:
+        model: Model exposing predict_batch (or predict)
+        table: Input table with a text column
+        text_column: Name of the text column
+        labels_column: Optional column of a label or list of labels per row
+        entity_type: Label applied to rows without a labels column/value
+        doc_id_column: Optional column identifying documents, defaults to row index
+
+    Returns:
+        Table of (doc_id, start, end, label, score), one row per entity
+    """
+    require_pyarrow()
+
+    text_values = text_column_values(table, text_column)
+    label_values = labels_column_values(table, labels_column)
+
+    # Reject oversized requests before expanding them into Python objects
+    num_pairs = count_pairs(text_values, label_values, entity_type)
+    if num_pairs > settings.BULK_MAX_ROWS:
+        raise BulkInputError(
+            f"Bulk request has {num_pairs} text/label pairs, over the limit of {settings.BULK_MAX_ROWS}"
+        )
+
+    texts = text_values.to_pylist()
+    labels = label_values.to_pylist() if label_values is not None else [None] * len(texts)
+
+    if doc_id_column and doc_id_column in table.column_names:
+        doc_id_type = table.schema.field(doc_id_column).type
+        doc_ids = table.column(doc_id_column).to_pylist()
+    else:
+        doc_id_type = pa.int64()
+        doc_ids = list(range(len(texts)))
+
+    # Expand rows into one (text, label) pair per requested label
+    pair_rows: List[int] = []
+    pair_texts: List[str] = []
+    pair_labels: List[str] = []
+    for row, (text, row_labels) in enumerate(zip(texts, labels)):
+        if not text:
+            continue
+        if row_labels is None:
+            row_labels = [entity_type] if entity_type else []
+        elif isinstance(row_labels, str):
+            row_labels = [row_labels]
+        for label in row_labels:
+            pair_rows.append(row)
+            pair_texts.append(text)
+            pair_labels.append(label)
+
+    if not pair_labels and any(texts):
+        raise BulkInputError("No labels given: provide a labels column or an entity_type")
+
+    if hasattr(model, "predict_batch"):
+        results = model.predict_batch(pair_texts, pair_labels)
+    else:
+        results = [model.predict(text, label) for text, label in zip(pair_texts, pair_labels)]
+
+    bulk_rows_counter.inc(len(pair_labels))
+
+    columns: Dict[str, List[Any]] = {"doc_id": [], "start": [], "end": [], "label": [], "score": []}
+    for row, label, entities in zip(pair_rows, pair_labels, results):
+        for entity in entities:
+            columns["doc_id"].append(doc_ids[row])
+            columns["start"].append(entity["start"])
+            columns["end"].append(entity["end"])
+            columns["label"].append(entity.get("entity_type", label))
+            columns["score"].append(entity["score"])
+
+    schema = entities_schema(doc_id_type)
+    return pa.Table.from_arrays(
+        [
+            pa.array(columns["doc_id"], type=doc_id_type),
+            pa.array(columns["start"], type=pa.int32()),
+            pa.array(columns["end"], type=pa.int32()),
+            pa.array(columns["label"], type=pa.string()).dictionary_encode(),
+            pa.array(columns["score"], type=pa.float32()),
+        ],
+        schema=schema
+    )
@@ -0,0 +1,148 @@
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.models.chunking import chunk_text
+from app.models.ner_model import GLiNERModel, model as default_model
+from prometheus_client import Counter, Histogram
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for cascade routing
+cascade_units_counter = Counter(
+    'model_cascade_units_total',
+    'Requests or chunks routed through the model cascade',
+    ['outcome']
+)
+cascade_tier_latency = Histogram(
+    'model_cascade_tier_seconds',
+    'Inference latency per cascade tier',
+    ['tier']
+)
+
+
+class CascadeModel:
+    """
+    Two-tier cascade that answers with a small GLiNER checkpoint and
+    escalates only low-confidence requests (or chunks) to the large model
+    """
+    def __init__(
+        self,
+        small_model: GLiNERModel,
+        large_model: GLiNERModel,
+        confidence_margin: Optional[float] = None,
+        chunk_size: Optional[int] = None
+    ):
+        """
+        Initialize the cascade
+
+        Args:
+            small_model: Fast first-tier model
+            large_model: Accurate second-tier model
+            confidence_margin: Minimum score for small-model spans to be accepted
+            chunk_size: Characters per routing chunk, 0 routes whole requests
+        """
+        self.small_model = small_model
+        self.large_model = large_model
+        self.confidence_margin = (
+            settings.CASCADE_CONFIDENCE_MARGIN if confidence_margin is None else confidence_margin
+        )
+        self.chunk_size = settings.CASCADE_CHUNK_SIZE if chunk_size is None else chunk_size
+
+    @property
+    def model_name(self) -> str:
+        return f"{self.small_model.model_name}->{self.large_model.model_name}"
+
+    @property
+    def version(self) -> Optional[str]:
+        if self.small_model.version is None or self.large_model.version is None:
+            return None
+        return f"{self.small_model.version}->{self.large_model.version}"
+
+    @property
+    def device(self) -> str:
+        return self.large_model.device
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.small_model.is_loaded and self.large_model.is_loaded
+
+    def ensure_model_loaded(self) -> None:
+        """
+        Ensure both tiers are loaded before inference
+        """
+        self.small_model.ensure_model_loaded()
+        self.large_model.ensure_model_loaded()
+
+    def is_confident(self, entities: List[Dict[str, Any]]) -> bool:
+        """
+        Whether small-model output can be accepted without escalation
+
+        Empty results are accepted unless CASCADE_ESCALATE_EMPTY is set,
+        since most short texts legitimately contain no entities.
+        """
+        if not entities:
+            return not settings.CASCADE_ESCALATE_EMPTY
+        return all(entity["score"] >= self.confidence_margin for entity in entities)
+
+    def _run_tier(self, tier: str, model: GLiNERModel, text: str, entity_type: str) -> List[Dict[str, Any]]:
+        with cascade_tier_latency.labels(tier=tier).time():
+            return model.predict(text, entity_type)
+
+    def predict(self, text: str, entity_type: str) -> List[Dict[str, Any]]:
+        """
+        Run inference through the cascade
+
+        Args:
+            text: Input text for NER
+            entity_type: The type of entity to extract
+
+        Returns:
+            List of extracted entities with positions relative to ``text``
+        """
+        entities = []
+
+        for offset, chunk in chunk_text(text, self.chunk_size):
+            chunk_entities = self._run_tier("small", self.small_model, chunk, entity_type)
+
+            if self.is_confident(chunk_entities):
+                cascade_units_counter.labels(outcome="accepted").inc()
+            else:
+                cascade_units_counter.labels(outcome="escalated").inc()
+                chunk_entities = self._run_tier("large", self.large_model, chunk, entity_type)
+
+            for entity in chunk_entities:
+                entities.append({
+                    **entity,
+                    "start": entity["start"] + offset,
+                    "end": entity["end"] + offset,
+                })
+
+        return entities
+
+
+# Global cascade instance, created on first use
+_cascade_model = None
+_cascade_lock = threading.Lock()
+
+
+def get_cascade_model() -> CascadeModel:
+    """
+    Get the global cascade instance, creating it on first use
+
+    Dependencies resolve in the threadpool, so creation is locked to keep
+    concurrent first requests from each loading a small model.
+    """
+    global _cascade_model
+    if _cascade_model is None:
+        with _cascade_lock:
+            if _cascade_model is None:
+                # Reuse the global model as the large tier
+                _cascade_model = CascadeModel(
+                    GLiNERModel(settings.CASCADE_SMALL_MODEL_NAME),
+                    default_model
+                )
+                logger.info(f"Cascade routing enabled: {_cascade_model.model_name}")
+    return _cascade_model
@@ -0,0 +1,31 @@
+from typing import List, Tuple
+
+
+def chunk_text(text: str, chunk_size: int) -> List[Tuple[int, str]]:
+    """
+    Split text into chunks of at most ``chunk_size`` characters
+
+    Chunks are broken on whitespace where possible so words are not split.
+
+    Args:
+        text: Input text
+        chunk_size: Maximum chunk length in characters, 0 disables chunking
+
+    Returns:
+        List of (offset, chunk) tuples
+    """
+    if chunk_size <= 0 or len(text) <= chunk_size:
+        return [(0, text)]
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + chunk_size, len(text))
+        if end < len(text):
+            split = text.rfind(" ", start, end)
+            if split > start:
+                end = split + 1
+        chunks.append((start, text[start:end]))
+        start = end
+
+    return chunks
@@ -0,0 +1,378 @@
+import os
+import math
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from app.models.memory import fits_memory_budget
+from prometheus_client import Gauge
+
+# torch is imported on first use to keep app startup fast
+torch = lazy_import("torch")
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for execution tuning
+torch_threads_gauge = Gauge('model_torch_threads', 'Torch thread pool sizes', ['pool'])
+execution_mode_gauge = Gauge('model_execution_mode_info', 'Active torch execution mode', ['mode'])
+
+# Supported execution modes
+EXECUTION_MODES = ("eager", "compile", "torchscript")
+
+# cgroup files used to derive the container CPU quota
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+# Torch only allows the inter-op pool to be sized once per process
+_threads_configured = False
+
+
+def get_cgroup_cpu_limit() -> Optional[float]:
+    """
+    Read the CPU quota assigned to this container from cgroups
+
+    Returns:
+        Number of CPUs allowed by the quota, or None if unlimited/unavailable
+    """
+    try:
+        if os.path.exists(CGROUP_V2_CPU_MAX):
+            with open(CGROUP_V2_CPU_MAX) as f:
+                quota, period = f.read().split()[:2]
+            if quota == "max":
+                return None
+            return int(quota) / int(period)
+
+        if os.path.exists(CGROUP_V1_CPU_QUOTA) and os.path.exists(CGROUP_V1_CPU_PERIOD):
+            with open(CGROUP_V1_CPU_QUOTA) as f:
+                quota = int(f.read().strip())
+            with open(CGROUP_V1_CPU_PERIOD) as f:
+                period = int(f.read().strip())
+            if quota <= 0 or period <= 0:
+                return None
+            return quota / period
+
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read cgroup CPU quota: {e}")
+
+    return None
+
+
+def get_available_cpus() -> int:
+    """
+    Number of CPUs this process may actually use
+
+    Takes the smaller of the cgroup quota, the scheduler affinity mask
+    and the host CPU count, so torch does not size its pools for cores
+    the container will be throttled on.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = get_cgroup_cpu_limit()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+
+    return max(1, cpus)
+
+
+def configure_torch_threads(
+    num_threads: Optional[int] = None,
+    interop_threads: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Size torch's intra-op and inter-op thread pools
+
+    Args:
+        num_threads: Intra-op threads, defaults to the available CPU count
+        interop_threads: Inter-op threads, defaults to 1
+
+    Returns:
+        Tuple of (intra-op threads, inter-op threads) in effect
+    """
+    global _threads_configured
+
+    intra = num_threads or get_available_cpus()
+    inter = interop_threads or 1
+
+    torch.set_num_threads(intra)
+
+    if not _threads_configured:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError as e:
+            # Raised if parallel work already started in this process
+            logger.warning(f"Could not set torch inter-op threads: {e}")
+        _threads_configured = True
+
+    intra = torch.get_num_threads()
+    inter = torch.get_num_interop_threads()
+
+    torch_threads_gauge.labels(pool="intra_op").set(intra)
+    torch_threads_gauge.labels(pool="inter_op").set(inter)
+    logger.info(f"Configured torch threads: intra_op={intra}, inter_op={inter}")
+
+    return intra, inter
+
+
+def inference_context():
+    """
+    Context manager for running the forward pass
+
+    Uses torch.inference_mode where available, which skips version-counter
+    and view tracking on top of what torch.no_grad disables.
+    """
+    if hasattr(torch, "inference_mode"):
+        return torch.inference_mode()
+    return torch.no_grad()
+
+
+def bucket_length(length: int, buckets: List[int]) -> int:
+    """
+    Round a sequence length up to the nearest configured bucket
+
+    Args:
+        length: Tokenized sequence length
+        buckets: Sorted list of bucket sizes
+
+    Returns:
+        Bucket size to pad to, or the length itself if it exceeds all buckets
+    """
+    for bucket in sorted(buckets):
+        if length <= bucket:
+            return bucket
+    return length
+
+
+def batch_size_buckets(max_batch_size: int) -> List[int]:
+    """
+    Batch sizes that compiled models are specialised to
+
+    Powers of two up to ``max_batch_size``, plus ``max_batch_size`` itself,
+    so partial and memory-halved batches pad to one of a few warmed-up shapes.
+    """
+    buckets = []
+    size = 1
+    while size < max_batch_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max(1, max_batch_size))
+    return buckets
+
+
+def pad_batch(inputs: Dict[str, Any], batch_size: int) -> Dict[str, Any]:
+    """
+    Pad tokenized inputs up to ``batch_size`` rows by repeating the last row
+
+    The extra rows only keep the input shape fixed; their outputs are ignored.
+    """
+    rows = inputs["input_ids"].shape[0]
+    if rows >= batch_size:
+        return inputs
+    return {
+        key: torch.cat([value, value[-1:].expand(batch_size - rows, *value.shape[1:])])
+        for key, value in inputs.items()
+    }
+
+
+class _TracedModelWrapper:
+    """
+    Adapter giving a TorchScript-traced model the same call signature
+    and output shape (an object with ``.logits``) as the eager model
+    """
+    def __init__(self, traced):
+        self.traced = traced
+
+    def __call__(self, input_ids, attention_mask=None, **kwargs):
+        outputs = self.traced(input_ids, attention_mask)
+        logits = outputs["logits"] if isinstance(outputs, dict) else outputs[0]
+        return _ModelOutput(logits=logits)
+
+
+class _ModelOutput:
+    """
+    Minimal stand-in for a transformers ModelOutput
+    """
+    def __init__(self, logits):
+        self.logits = logits
+
+
+def build_example_inputs(tokenizer, device: str, length: int, batch_size: int = 1) -> Dict[str, Any]:
+    """
+    Create dummy tokenized inputs of a fixed shape
+
+    Args:
+        tokenizer: Tokenizer used by the model
+        device: Device to place the tensors on
+        length: Padded sequence length
+        batch_size: Number of sequences in the batch
+
+    Returns:
+        Dictionary of model inputs
+    """
+    return tokenizer(
+        ["Find entity in: warm up"] * batch_size,
+        padding="max_length",
+        truncation=True,
+        max_length=length,
+        return_tensors="pt"
+    ).to(device)
+
+
+def warmup_shapes(buckets: List[int], batch_sizes: Optional[List[int]] = None) -> List[Tuple[int, int]]:
+    """
+    (batch size, sequence length) shapes a compiled model is warmed up for
+
+    Batched shapes over the memory budget are skipped, since batched
+    prediction never runs them.
+    """
+    return [
+        (batch_size, length)
+        for batch_size in (batch_sizes or [1])
+        for length in sorted(buckets)
+        if batch_size == 1 or fits_memory_budget(length, batch_size)
+    ]
+
+
+def raise_recompile_limit(num_shapes: int) -> None:
+    """
+    Let torch.compile keep one static graph per warmed-up shape
+
+    Dynamo stops compiling a function after its recompile limit (8 by
+    default) and silently runs any further shapes eagerly.
+    """
+    dynamo_config = torch._dynamo.config
+    # Renamed from cache_size_limit in newer torch releases
+    name = "recompile_limit" if hasattr(dynamo_config, "recompile_limit") else "cache_size_limit"
+    if getattr(dynamo_config, name) < num_shapes:
+        setattr(dynamo_config, name, num_shapes)
+    if getattr(dynamo_config, "accumulated_cache_size_limit", num_shapes) < num_shapes:
+        dynamo_config.accumulated_cache_size_limit = num_shapes
+
+
+def optimize_model(model, mode: str, example_inputs: Dict[str, Any], num_shapes: int = 0):
+    """
+    Produce the model used at inference time for the given execution mode
+
+    Args:
+        model: Eager model in eval mode
+        mode: One of "eager", "compile" or "torchscript"
+        example_inputs: Inputs used to trace the model
+        num_shapes: Number of input shapes the compiled model must serve
+
+    Returns:
+        Model to call for inference
+    """
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode: {mode}")
+
+    if mode == "compile":
+        if not hasattr(torch, "compile"):
+            raise RuntimeError("torch.compile requires torch>=2.0")
+        if num_shapes:
+            raise_recompile_limit(num_shapes)
+        return torch.compile(model, dynamic=False)
+
+    if mode == "torchscript":
+        # Tracing under inference_mode produces inference tensors that
+        # cannot be saved into the graph, so use no_grad here
+        with torch.no_grad():
+            traced = torch.jit.trace(
+                model,
+                (example_inputs["input_ids"], example_inputs["attention_mask"]),
+                strict=False,
+                check_trace=False
+            )
+        return _TracedModelWrapper(torch.jit.freeze(traced))
+
+    return model
+
+
+def warmup(
+    model,
+    tokenizer,
+    device: str,
+    buckets: List[int],
+    batch_sizes: Optional[List[int]] = None
+) -> None:
+    """
+    Run one forward pass per (batch size, sequence length) bucket so
+    compilation happens at startup rather than on the first requests that
+    hit each shape
+
+    Batched shapes over the memory budget are skipped, since batched
+    prediction never runs them.
+    """
+    with inference_context():
+        for batch_size, length in warmup_shapes(buckets, batch_sizes):
+            model(**build_example_inputs(tokenizer, device, length, batch_size))
+    logger.info(f"Warmed up model for sequence buckets {sorted(buckets)} and batch sizes {batch_sizes or [1]}")
+
+
+def check_parity(
+    eager_model,
+    optimized_model,
+    tokenizer,
+    device: str,
+    buckets: List[int],
+    atol: float
+) -> bool:
+    """
+    Verify the optimized model produces the same logits as eager mode
+
+    Returns:
+        True if all buckets agree within the given tolerance
+    """
+    with inference_context():
+        for length in sorted(buckets):
+            inputs = build_example_inputs(tokenizer, device, length)
+            expected = eager_model(**inputs).logits
+            actual = optimized_model(**inputs).logits
+            max_diff = (expected - actual).abs().max().item()
+            if max_diff > atol:
+                logger.warning(
+                    f"Output parity check failed at length {length}: "
+                    f"max abs diff {max_diff:.6f} > {atol}"
+                )
+                return False
+    return True
+
+
+def prepare_runtime_model(model, tokenizer, device: str):
+    """
+    Apply the configured execution mode to a loaded model
+
+    Falls back to the eager model if optimization or the parity check fails,
+    so a bad compile never takes the service down.
+
+    Returns:
+        Tuple of (model to use for inference, execution mode in effect)
+    """
+    mode = settings.TORCH_EXECUTION_MODE
+    buckets = settings.SEQUENCE_LENGTH_BUCKETS
+
+    if mode != "eager":
+        try:
+            batch_sizes = batch_size_buckets(settings.BULK_BATCH_SIZE)
+            example_inputs = build_example_inputs(tokenizer, device, max(buckets))
+            optimized = optimize_model(
+                model, mode, example_inputs, num_shapes=len(warmup_shapes(buckets, batch_sizes))
+            )
+            warmup(optimized, tokenizer, device, buckets, batch_sizes)
+
+            if check_parity(model, optimized, tokenizer, device, buckets, settings.PARITY_ATOL):
+                execution_mode_gauge.labels(mode=mode).set(1)
+                logger.info(f"Using {mode} execution mode")
+                return optimized, mode
+
+            logger.warning(f"Falling back to eager mode: {mode} output differs from eager")
+
+        except Exception as e:
+            logger.error(f"Failed to prepare {mode} execution mode, falling back to eager: {e}")
+
+    execution_mode_gauge.labels(mode="eager").set(1)
+    return model, "eager"
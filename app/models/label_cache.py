@@ -0,0 +1,216 @@
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from prometheus_client import Counter
+
+# torch is imported on first use to keep app startup fast
+torch = lazy_import("torch")
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Bump when the stored embedding format or pooling changes
+LABEL_CACHE_FORMAT_VERSION = 1
+
+# Metrics for the label embedding cache
+label_cache_counter = Counter(
+    'model_label_cache_lookups_total',
+    'Label embedding cache lookups',
+    ['result']
+)
+
+
+def compute_cache_version(model_name: str, revision: Optional[str] = None) -> str:
+    """
+    Derive a cache version from the model identity
+
+    Args:
+        model_name: HuggingFace model name or path
+        revision: Model revision/commit hash, if known
+
+    Returns:
+        Short hash identifying the model and cache format
+    """
+    key = f"{model_name}:{revision or ''}:{LABEL_CACHE_FORMAT_VERSION}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+def fingerprint_state_dict(state_dict: Dict[str, "torch.Tensor"]) -> str:
+    """
+    Hash module weights, for checkpoints without a commit hash
+
+    Args:
+        state_dict: Parameter and buffer tensors by name
+
+    Returns:
+        Hex digest that changes whenever any tensor's name, shape, dtype or values change
+    """
+    digest = hashlib.sha256()
+    for name in sorted(state_dict):
+        tensor = state_dict[name].detach().cpu().contiguous()
+        digest.update(f"{name}:{tuple(tensor.shape)}:{tensor.dtype}".encode("utf-8"))
+        digest.update(tensor.reshape(-1).view(torch.uint8).numpy().tobytes())
+    return digest.hexdigest()
+
+
+class LabelEmbeddingCache:
+    """
+    Versioned cache of label embeddings for bi-encoder GLiNER models
+
+    Embeddings for the fixed label vocabulary are kept in memory and
+    persisted under ``<cache_dir>/label_embeddings`` so restarts do not
+    re-encode them. Other labels sent by clients are kept in a bounded
+    in-memory LRU and never persisted.
+    """
+    def __init__(
+        self,
+        model_name: str,
+        version: str,
+        cache_dir: Optional[str] = None,
+        vocabulary: Optional[Iterable[str]] = None,
+        max_extra_labels: Optional[int] = None
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            model_name: Model the embeddings were computed with
+            version: Cache version from compute_cache_version
+            cache_dir: Directory to persist embeddings in, None keeps them in memory only
+            vocabulary: Labels that are pinned in memory and persisted
+            max_extra_labels: Max other labels kept in memory, defaults to LABEL_CACHE_MAX_EXTRA
+        """
+        self.model_name = model_name
+        self.version = version
+        self.cache_dir = cache_dir
+        self.vocabulary = set(vocabulary or [])
+        self.max_extra_labels = (
+            settings.LABEL_CACHE_MAX_EXTRA if max_extra_labels is None else max_extra_labels
+        )
+        self.embeddings: Dict[str, "torch.Tensor"] = {}
+        self.extra_embeddings: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        File the cache is persisted to
+        """
+        if not self.cache_dir:
+            return None
+        slug = self.model_name.replace("/", "--")
+        return os.path.join(self.cache_dir, "label_embeddings", f"{slug}-{self.version}.pt")
+
+    def load(self) -> int:
+        """
+        Load persisted vocabulary embeddings for this version, if present
+
+        Returns:
+            Number of labels loaded
+        """
+        path = self.path
+        if not path or not os.path.exists(path):
+            return 0
+
+        try:
+            data = torch.load(path, map_location="cpu")
+            if data.get("version") != self.version:
+                logger.warning(f"Ignoring label cache with stale version at {path}")
+                return 0
+            embeddings = {
+                label: embedding for label, embedding in data["embeddings"].items()
+                if label in self.vocabulary
+            }
+            with self._lock:
+                self.embeddings.update(embeddings)
+            logger.info(f"Loaded {len(embeddings)} label embeddings from {path}")
+            return len(embeddings)
+
+        except Exception as e:
+            logger.warning(f"Failed to load label cache from {path}: {e}")
+            return 0
+
+    def save(self) -> None:
+        """
+        Persist the vocabulary embeddings
+        """
+        path = self.path
+        if not path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._lock:
+                data = {"version": self.version, "embeddings": dict(self.embeddings)}
+            # Write to a temp file first so readers never see a partial cache
+            tmp_path = f"{path}.tmp"
+            torch.save(data, tmp_path)
+            os.replace(tmp_path, path)
+
+        except Exception as e:
+            logger.warning(f"Failed to persist label cache to {path}: {e}")
+
+    def _lookup(self, label: str) -> Optional["torch.Tensor"]:
+        embedding = self.embeddings.get(label)
+        if embedding is None:
+            embedding = self.extra_embeddings.get(label)
+            if embedding is not None:
+                self.extra_embeddings.move_to_end(label)
+        return embedding
+
+    def get_many(
+        self,
+        labels: List[str],
+        encode_fn: Callable[[List[str]], "torch.Tensor"]
+    ) -> "torch.Tensor":
+        """
+        Get embeddings for labels, encoding and caching any that are missing
+
+        Only vocabulary labels are persisted, so the cache file is rewritten
+        when the vocabulary is first encoded rather than on request threads.
+
+        Args:
+            labels: Label texts
+            encode_fn: Function encoding a list of labels to a (len, dim) tensor
+
+        Returns:
+            Tensor of shape (len(labels), dim) in the order of ``labels``
+        """
+        found: Dict[str, "torch.Tensor"] = {}
+        with self._lock:
+            for label in dict.fromkeys(labels):
+                embedding = self._lookup(label)
+                if embedding is not None:
+                    found[label] = embedding
+
+        missing = [label for label in dict.fromkeys(labels) if label not in found]
+        label_cache_counter.labels(result="hit").inc(len(labels) - len(missing))
+
+        if missing:
+            label_cache_counter.labels(result="miss").inc(len(missing))
+            encoded = encode_fn(missing).detach().cpu()
+            new_vocabulary = False
+
+            with self._lock:
+                for label, embedding in zip(missing, encoded):
+                    embedding = embedding.clone()
+                    found[label] = embedding
+                    if label in self.vocabulary:
+                        self.embeddings[label] = embedding
+                        new_vocabulary = True
+                    else:
+                        self.extra_embeddings[label] = embedding
+                        self.extra_embeddings.move_to_end(label)
+                while len(self.extra_embeddings) > self.max_extra_labels:
+                    self.extra_embeddings.popitem(last=False)
+
+            if new_vocabulary:
+                self.save()
+
+        return torch.stack([found[label] for label in labels])
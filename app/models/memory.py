@@ -0,0 +1,192 @@
+import os
+import signal
+import asyncio
+import logging
+import resource
+import threading
+from contextlib import contextmanager
+from typing import Callable, List, Optional
+
+from app.core.config import settings
+from app.core.lazy import lazy_import
+from prometheus_client import Counter, Gauge, Histogram
+
+# torch is imported on first use to keep app startup fast
+torch = lazy_import("torch")
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for memory accounting. Predictions run concurrently, so these are
+# process-level figures observed around forward passes, not per-request ones.
+process_rss_growth_histogram = Histogram(
+    'model_process_rss_growth_bytes',
+    'Process RSS growth across a forward pass, including allocations by concurrent requests',
+    ['scope'],
+    buckets=(0, 1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9)
+)
+process_cuda_peak_histogram = Histogram(
+    'model_process_cuda_peak_bytes',
+    'Process peak CUDA tensor memory over a window of overlapping forward passes',
+    ['scope'],
+    buckets=(1e6, 1e7, 5e7, 1e8, 2.5e8, 5e8, 1e9, 2e9, 4e9)
+)
+memory_budget_counter = Counter(
+    'model_memory_budget_actions_total',
+    'Requests split or rejected because projected memory exceeded the budget',
+    ['action']
+)
+worker_draining_gauge = Gauge('worker_draining', 'Whether this worker is draining before a memory recycle')
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+class MemoryBudgetExceeded(RuntimeError):
+    """
+    Raised when a request's projected memory exceeds the budget and cannot be split
+    """
+
+
+def get_rss_bytes() -> int:
+    """
+    Current resident set size of this process in bytes
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is the peak, in KiB on Linux; best effort off Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def projected_memory_bytes(num_tokens: int, batch_size: int = 1) -> int:
+    """
+    Estimate activation memory for a forward pass
+
+    Args:
+        num_tokens: Padded sequence length
+        batch_size: Number of sequences in the batch
+
+    Returns:
+        Projected bytes, from MEMORY_BYTES_PER_TOKEN
+    """
+    return num_tokens * batch_size * settings.MEMORY_BYTES_PER_TOKEN
+
+
+def get_memory_budget_bytes() -> Optional[int]:
+    """
+    Per-forward-pass memory budget, or None if unlimited
+    """
+    if not settings.MEMORY_REQUEST_BUDGET_MB:
+        return None
+    return settings.MEMORY_REQUEST_BUDGET_MB * 1024 * 1024
+
+
+def fits_memory_budget(num_tokens: int, batch_size: int = 1) -> bool:
+    """
+    Whether a forward pass of this shape fits the memory budget
+    """
+    budget = get_memory_budget_bytes()
+    return budget is None or projected_memory_bytes(num_tokens, batch_size) <= budget
+
+
+# Forward passes currently inside track_memory
+_tracked_sections = 0
+_tracked_lock = threading.Lock()
+
+
+@contextmanager
+def track_memory(scope: str):
+    """
+    Record process-level RSS growth and peak CUDA tensor memory around the enclosed block
+
+    RSS growth includes whatever concurrent requests allocated meanwhile.
+    The CUDA peak counter is process-global, so it is only reset when no
+    other tracked block is running and observed when the last one exits,
+    giving the peak over each window of overlapping forward passes.
+
+    Args:
+        scope: "request" for a single prediction, "batch" for batched encoding
+    """
+    global _tracked_sections
+
+    use_cuda = torch.cuda.is_available()
+    with _tracked_lock:
+        if use_cuda and _tracked_sections == 0:
+            torch.cuda.reset_peak_memory_stats()
+        _tracked_sections += 1
+
+    rss_before = get_rss_bytes()
+    try:
+        yield
+    finally:
+        process_rss_growth_histogram.labels(scope=scope).observe(max(0, get_rss_bytes() - rss_before))
+        with _tracked_lock:
+            _tracked_sections -= 1
+            if use_cuda and _tracked_sections == 0:
+                process_cuda_peak_histogram.labels(scope=scope).observe(torch.cuda.max_memory_allocated())
+
+
+class MemoryGuard:
+    """
+    Recycles the worker before it is OOM-killed
+
+    After each prediction the process RSS is compared with the recycle
+    threshold. Once crossed, the worker reports itself as draining so the
+    readiness probe takes it out of rotation, notifies drain callbacks (so
+    long-lived connections can be closed), then sends itself SIGTERM after
+    MEMORY_DRAIN_SECONDS so the server shuts down gracefully and the
+    orchestrator starts a fresh one.
+    """
+    def __init__(self, threshold_mb: Optional[int] = None, drain_seconds: Optional[float] = None):
+        self.threshold_mb = threshold_mb if threshold_mb is not None else settings.MEMORY_RECYCLE_THRESHOLD_MB
+        self.drain_seconds = drain_seconds if drain_seconds is not None else settings.MEMORY_DRAIN_SECONDS
+        self.draining = False
+        self._drain_callbacks: List[Callable[[], None]] = []
+    
+    def add_drain_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Register a callback run on the event loop when draining starts
+        """
+        self._drain_callbacks.append(callback)
+    
+    def remove_drain_callback(self, callback: Callable[[], None]) -> None:
+        """
+        Unregister a drain callback
+        """
+        if callback in self._drain_callbacks:
+            self._drain_callbacks.remove(callback)
+
+    def check(self) -> bool:
+        """
+        Start draining if RSS is above the recycle threshold
+
+        Must be called from the event loop.
+
+        Returns:
+            True if the worker is draining
+        """
+        if self.draining or not self.threshold_mb:
+            return self.draining
+
+        rss_mb = get_rss_bytes() / (1024 * 1024)
+        if rss_mb > self.threshold_mb:
+            logger.warning(
+                f"RSS {rss_mb:.0f}MB exceeds recycle threshold {self.threshold_mb}MB, "
+                f"draining for {self.drain_seconds}s before restart"
+            )
+            self.draining = True
+            worker_draining_gauge.set(1)
+            for callback in list(self._drain_callbacks):
+                callback()
+            asyncio.get_running_loop().call_later(self.drain_seconds, self._recycle)
+
+        return self.draining
+
+    def _recycle(self) -> None:
+        logger.warning("Recycling worker to release memory")
+        os.kill(os.getpid(), signal.SIGTERM)
+
+
+# Global memory guard for this worker
+memory_guard = MemoryGuard()
@@ -1,13 +1,41 @@
 import os
 import time
 import logging
-from typing import Dict, List, Any, Optional, Tuple
-import torch
-from transformers import AutoTokenizer, AutoModelForTokenClassification
+import threading
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Any, Optional, Union
 
 from app.core.config import settings
+from app.core.lazy import lazy_import, optional_import
+from app.core.profiling import profiler
+from app.models.execution import (
+    batch_size_buckets,
+    bucket_length,
+    configure_torch_threads,
+    inference_context,
+    pad_batch,
+    prepare_runtime_model,
+)
+from app.models.chunking import chunk_text
+from app.models.label_cache import LabelEmbeddingCache, compute_cache_version, fingerprint_state_dict
+from app.models.memory import (
+    MemoryBudgetExceeded,
+    fits_memory_budget,
+    get_memory_budget_bytes,
+    memory_budget_counter,
+    projected_memory_bytes,
+    track_memory,
+)
 from prometheus_client import Histogram
 
+# torch and transformers are imported on first use to keep app startup fast
+torch = lazy_import("torch")
+AutoTokenizer = None
+AutoModelForTokenClassification = None
+
+# Optional dependency for bi-encoder checkpoints, imported on first use
+gliner = optional_import("gliner")
+
 # Setup logging
 logger = logging.getLogger(__name__)
 
@@ -15,6 +43,18 @@ logger = logging.getLogger(__name__)
 model_loading_time = Histogram('model_loading_seconds', 'Time to load model')
 model_inference_time = Histogram('model_inference_seconds', 'Time for model inference')
 
+def _import_transformers() -> None:
+    """
+    Import the transformers model classes on first model load
+    """
+    global AutoTokenizer, AutoModelForTokenClassification
+    if AutoTokenizer is None or AutoModelForTokenClassification is None:
+        transformers = lazy_import("transformers")
+        AutoTokenizer = AutoTokenizer or transformers.AutoTokenizer
+        AutoModelForTokenClassification = (
+            AutoModelForTokenClassification or transformers.AutoModelForTokenClassification
+        )
+
 class GLiNERModel:
     """
     Wrapper for the GLiNER NER model to handle loading and inference
@@ -27,13 +67,53 @@ class GLiNERModel:
             model_name: HuggingFace model name or path, defaults to config value
         """
         self.model_name = model_name or settings.MODEL_NAME
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self._device = None
         self.tokenizer = None
         self.model = None
         
+        # Model actually called at inference time (eager, compiled or traced)
+        self.runtime_model = None
+        self.execution_mode = "eager"
+        
+        # Bi-encoder GLiNER model and its precomputed label embeddings,
+        # only used when BI_ENCODER_ENABLED is set
+        self.bi_encoder = None
+        self.label_cache = None
+        
+        # Identifies the loaded checkpoint for result caches, set on load
+        self._version = None
+        
         # Cache flag to track if model is loaded
         self.is_loaded = False
+        self._load_lock = threading.Lock()
         
+    @property
+    def device(self) -> str:
+        """
+        Device used for inference, detected on first access
+        """
+        if self._device is None:
+            self._device = "cuda" if torch.cuda.is_available() else "cpu"
+        return self._device
+    
+    @property
+    def version(self) -> Optional[str]:
+        """
+        Cache version of the loaded checkpoint
+        
+        Derived from the checkpoint's commit hash; checkpoints without one
+        (e.g. local paths) get a new version on every load, so caches never
+        serve results from a previous load.
+        """
+        return self._version
+    
+    def _checkpoint_revision(self) -> Optional[str]:
+        """
+        Commit hash of the loaded checkpoint, if known
+        """
+        loaded = self.bi_encoder if self.bi_encoder is not None else self.model
+        return getattr(getattr(loaded, "config", None), "_commit_hash", None)
+    
     def load_model(self) -> None:
         """
         Load the model and tokenizer
@@ -43,16 +123,38 @@ class GLiNERModel:
                 start_time = time.time()
                 logger.info(f"Loading GLiNER model: {self.model_name}")
                 
-                # Load tokenizer and model
-                self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-                self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+                # Size torch thread pools to the container's CPU quota
+                if self.device == "cpu":
+                    configure_torch_threads(
+                        settings.TORCH_NUM_THREADS,
+                        settings.TORCH_INTEROP_THREADS
+                    )
                 
-                # Move model to appropriate device
-                self.model.to(self.device)
-                
-                # Set model to evaluation mode
-                self.model.eval()
+                if settings.BI_ENCODER_ENABLED:
+                    # Bi-encoder checkpoints are served by their own span
+                    # scorer; the label vocabulary is encoded once here
+                    self._load_bi_encoder()
+                else:
+                    # Load tokenizer and model
+                    _import_transformers()
+                    self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+                    self.model = AutoModelForTokenClassification.from_pretrained(self.model_name)
+                    
+                    # Move model to appropriate device
+                    self.model.to(self.device)
+                    
+                    # Set model to evaluation mode
+                    self.model.eval()
+                    
+                    # Apply the configured execution mode (eager, compile, torchscript)
+                    self.runtime_model, self.execution_mode = prepare_runtime_model(
+                        self.model, self.tokenizer, self.device
+                    )
                 
+                self._version = compute_cache_version(
+                    self.model_name,
+                    self._checkpoint_revision() or f"load-{time.time_ns()}"
+                )
                 self.is_loaded = True
                 
                 load_time = time.time() - start_time
@@ -65,9 +167,13 @@ class GLiNERModel:
     def ensure_model_loaded(self) -> None:
         """
         Ensure the model is loaded before inference
+        
+        Concurrent first requests wait for a single load.
         """
         if not self.is_loaded:
-            self.load_model()
+            with self._load_lock:
+                if not self.is_loaded:
+                    self.load_model()
     
     def predict(self, text: str, entity_type: str) -> List[Dict[str, Any]]:
         """
@@ -82,17 +188,26 @@ class GLiNERModel:
         """
         self.ensure_model_loaded()
         
+        if self.bi_encoder is not None:
+            return self.predict_labels(text, [entity_type])
+        
+        try:
+            # Prepare inputs for GLiNER model
+            inputs = self._tokenize(f"Find {entity_type} in: {text}")
+        except Exception as e:
+            logger.error(f"Tokenization error: {e}")
+            raise RuntimeError(f"Failed to run prediction: {str(e)}")
+        
+        # Split or reject requests whose projected memory exceeds the budget
+        num_tokens = inputs["input_ids"].shape[-1]
+        if not fits_memory_budget(num_tokens):
+            return self._predict_split(text, num_tokens, lambda chunk: self.predict(chunk, entity_type))
+        
         with model_inference_time.time():
             try:
-                # Prepare inputs for GLiNER model
-                inputs = self.tokenizer(
-                    f"Find {entity_type} in: {text}",
-                    return_tensors="pt"
-                ).to(self.device)
-                
-                # Run inference with no gradient calculation
-                with torch.no_grad():
-                    outputs = self.model(**inputs)
+                # Run inference without autograd tracking
+                with track_memory("request"), inference_context(), profiler.profile_forward():
+                    outputs = self.runtime_model(**inputs)
                 
                 # Process outputs and extract entities
                 # Note: This is a simplified implementation
@@ -105,6 +220,278 @@ class GLiNERModel:
                 logger.error(f"Prediction error: {e}")
                 raise RuntimeError(f"Failed to run prediction: {str(e)}")
     
+    def _predict_split(
+        self,
+        text: str,
+        num_tokens: int,
+        predict_chunk: Callable[[str], List[Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Predict an over-budget text in chunks sized to fit the memory budget
+        
+        Args:
+            text: Input text for NER
+            num_tokens: Token count of the full request
+            predict_chunk: Runs inference on one chunk of the text
+            
+        Raises:
+            MemoryBudgetExceeded: If splitting is disabled or the text cannot be split further
+        """
+        projected = projected_memory_bytes(num_tokens)
+        
+        if settings.MEMORY_SPLIT_OVERSIZED and len(text) > 1:
+            # Shrink proportionally, with headroom for the prompt tokens
+            num_chunks = max(2, -(-projected // get_memory_budget_bytes()) + 1)
+            chunks = chunk_text(text, max(1, len(text) // num_chunks))
+            
+            if len(chunks) > 1:
+                memory_budget_counter.labels(action="split").inc()
+                logger.info(f"Splitting request of {num_tokens} tokens into {len(chunks)} chunks")
+                
+                entities = []
+                for offset, chunk in chunks:
+                    for entity in predict_chunk(chunk):
+                        entities.append({
+                            **entity,
+                            "start": entity["start"] + offset,
+                            "end": entity["end"] + offset,
+                        })
+                return entities
+        
+        memory_budget_counter.labels(action="rejected").inc()
+        raise MemoryBudgetExceeded(
+            f"Request of {num_tokens} tokens needs ~{projected // (1024 * 1024)}MB, "
+            f"over the {settings.MEMORY_REQUEST_BUDGET_MB}MB budget"
+        )
+    
+    def predict_labels(self, text: str, entity_types: List[str]) -> List[Dict[str, Any]]:
+        """
+        Run bi-encoder inference for several entity types at once
+        
+        The text is encoded once and scored against cached label embeddings
+        by the checkpoint's own span scorer, so each additional label only
+        adds a row to the span/label score matrix.
+        
+        Args:
+            text: Input text for NER
+            entity_types: The types of entity to extract
+            
+        Returns:
+            List of extracted entities with positions and scores
+        """
+        self.ensure_model_loaded()
+        
+        if self.bi_encoder is None:
+            raise RuntimeError("Bi-encoder inference requires BI_ENCODER_ENABLED")
+        
+        num_tokens = len(self.tokenizer(text)["input_ids"])
+        if not fits_memory_budget(num_tokens):
+            return self._predict_split(text, num_tokens, lambda chunk: self.predict_labels(chunk, entity_types))
+        
+        with model_inference_time.time():
+            try:
+                label_embeddings = self.label_cache.get_many(
+                    entity_types, self._encode_labels
+                ).to(self.device)
+                
+                with track_memory("request"), inference_context(), profiler.profile_forward():
+                    # Scores are the span scorer's sigmoid probabilities, the
+                    # same calibrated scores GLiNER.predict_entities thresholds
+                    spans = self.bi_encoder.predict_with_embeds(
+                        text,
+                        label_embeddings,
+                        entity_types,
+                        threshold=settings.BI_ENCODER_THRESHOLD
+                    )
+                
+                return [
+                    {
+                        "text": span["text"],
+                        "start": span["start"],
+                        "end": span["end"],
+                        "entity_type": span["label"],
+                        "score": float(span["score"])
+                    }
+                    for span in spans
+                ]
+                
+            except Exception as e:
+                logger.error(f"Prediction error: {e}")
+                raise RuntimeError(f"Failed to run prediction: {str(e)}")
+    
+    def _load_bi_encoder(self) -> None:
+        """
+        Load a bi-encoder GLiNER checkpoint and precompute the label vocabulary
+        
+        Raises:
+            RuntimeError: If gliner is not installed or the checkpoint has no
+                separate label encoder
+        """
+        if gliner is None:
+            raise RuntimeError("BI_ENCODER_ENABLED requires the gliner package (requirements-bi-encoder.txt)")
+        
+        self.bi_encoder = gliner.GLiNER.from_pretrained(self.model_name, cache_dir=settings.MODEL_CACHE_DIR)
+        
+        # Uni-encoder checkpoints encode labels jointly with the text, so
+        # there is nothing to precompute
+        if getattr(self.bi_encoder.config, "labels_encoder", None) is None:
+            self.bi_encoder = None
+            raise RuntimeError(
+                f"{self.model_name} is not a bi-encoder GLiNER checkpoint; "
+                f"use one with a labels_encoder or unset BI_ENCODER_ENABLED"
+            )
+        
+        self.bi_encoder.to(self.device)
+        self.bi_encoder.eval()
+        self.tokenizer = self.bi_encoder.data_processor.transformer_tokenizer
+        
+        # Local checkpoints have no commit hash, so key persisted embeddings
+        # on the label encoder weights instead of the name alone
+        revision = self._checkpoint_revision() or self._label_encoder_fingerprint()
+        self.label_cache = LabelEmbeddingCache(
+            self.model_name,
+            compute_cache_version(self.model_name, revision),
+            settings.MODEL_CACHE_DIR,
+            vocabulary=settings.LABEL_VOCABULARY
+        )
+        self.label_cache.load()
+        
+        if settings.LABEL_VOCABULARY:
+            self.label_cache.get_many(settings.LABEL_VOCABULARY, self._encode_labels)
+            logger.info(f"Label embeddings ready for {len(settings.LABEL_VOCABULARY)} labels")
+    
+    def _label_encoder_fingerprint(self) -> str:
+        """
+        Hash of the weights that produce label embeddings
+        """
+        encoder = self.bi_encoder.model.token_rep_layer
+        state_dict = {}
+        for name in ("labels_encoder", "labels_projection"):
+            module = getattr(encoder, name, None)
+            if isinstance(module, torch.nn.Module):
+                for key, value in module.state_dict().items():
+                    state_dict[f"{name}.{key}"] = value
+        return fingerprint_state_dict(state_dict)
+    
+    def _encode_labels(self, labels: List[str]) -> "torch.Tensor":
+        """
+        Encode label texts with the checkpoint's label encoder
+        """
+        with track_memory("batch"), inference_context():
+            return self.bi_encoder.encode_labels(labels)
+    
+    def predict_batch(self, texts: List[str], entity_types: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Run inference for many (text, entity type) pairs with batched forward passes
+        
+        Args:
+            texts: Input texts for NER
+            entity_types: The entity type to extract from each text
+            
+        Returns:
+            List of entity lists, one per input text
+        """
+        if len(texts) != len(entity_types):
+            raise ValueError("texts and entity_types must have the same length")
+        
+        self.ensure_model_loaded()
+        
+        # Bi-encoder models encode each text once for all of its labels
+        if self.bi_encoder is not None:
+            pairs_by_text: Dict[str, List[int]] = {}
+            for index, text in enumerate(texts):
+                pairs_by_text.setdefault(text, []).append(index)
+            
+            results: List[List[Dict[str, Any]]] = [[] for _ in texts]
+            for text, indices in pairs_by_text.items():
+                labels = list(dict.fromkeys(entity_types[index] for index in indices))
+                entities = self.predict_labels(text, labels)
+                for index in indices:
+                    results[index] = [
+                        entity for entity in entities if entity["entity_type"] == entity_types[index]
+                    ]
+            return results
+        
+        results = []
+        for start in range(0, len(texts), settings.BULK_BATCH_SIZE):
+            results.extend(self._predict_batch_chunk(
+                texts[start:start + settings.BULK_BATCH_SIZE],
+                entity_types[start:start + settings.BULK_BATCH_SIZE]
+            ))
+        return results
+    
+    def _predict_batch_chunk(self, texts: List[str], entity_types: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Run one padded forward pass, halving the batch until it fits the memory budget
+        """
+        try:
+            inputs = self._tokenize([
+                f"Find {entity_type} in: {text}" for text, entity_type in zip(texts, entity_types)
+            ])
+        except Exception as e:
+            logger.error(f"Tokenization error: {e}")
+            raise RuntimeError(f"Failed to run prediction: {str(e)}")
+        
+        # Compiled and traced models are specialised to fixed shapes, so pad
+        # the batch up to one of the batch sizes warmed up at load time
+        batch_size = len(texts)
+        if self.execution_mode != "eager":
+            batch_size = bucket_length(batch_size, batch_size_buckets(settings.BULK_BATCH_SIZE))
+        
+        num_tokens = inputs["input_ids"].shape[-1]
+        if not fits_memory_budget(num_tokens, batch_size):
+            # A single oversized text is split or rejected by predict
+            if len(texts) == 1:
+                return [self.predict(texts[0], entity_types[0])]
+            middle = len(texts) // 2
+            return (
+                self._predict_batch_chunk(texts[:middle], entity_types[:middle])
+                + self._predict_batch_chunk(texts[middle:], entity_types[middle:])
+            )
+        
+        with model_inference_time.time():
+            try:
+                with track_memory("batch"), inference_context(), profiler.profile_forward():
+                    outputs = self.runtime_model(**pad_batch(inputs, batch_size))
+                
+                return [
+                    self._process_outputs(
+                        SimpleNamespace(logits=outputs.logits[index:index + 1]),
+                        inputs,
+                        text,
+                        entity_type
+                    )
+                    for index, (text, entity_type) in enumerate(zip(texts, entity_types))
+                ]
+                
+            except Exception as e:
+                logger.error(f"Batch prediction error: {e}")
+                raise RuntimeError(f"Failed to run prediction: {str(e)}")
+    
+    def _tokenize(self, prompt: Union[str, List[str]]):
+        """
+        Tokenize a prompt, or a batch of prompts, for the runtime model
+        
+        Batches are padded to their longest prompt. Compiled and traced
+        models are specialised to fixed shapes, so in those modes inputs are
+        padded up to the nearest sequence bucket that was warmed up at load
+        time.
+        """
+        if self.execution_mode == "eager":
+            if isinstance(prompt, list):
+                return self.tokenizer(prompt, padding=True, return_tensors="pt").to(self.device)
+            return self.tokenizer(prompt, return_tensors="pt").to(self.device)
+        
+        prompts = prompt if isinstance(prompt, list) else [prompt]
+        length = max(len(input_ids) for input_ids in self.tokenizer(prompts)["input_ids"])
+        return self.tokenizer(
+            prompt,
+            padding="max_length",
+            truncation=True,
+            max_length=bucket_length(length, settings.SEQUENCE_LENGTH_BUCKETS),
+            return_tensors="pt"
+        ).to(self.device)
+    
     def _process_outputs(self, outputs, inputs, text: str, entity_type: str) -> List[Dict[str, Any]]:
         """
         Process model outputs to extract entities
@@ -149,6 +536,14 @@ model = GLiNERModel(settings.MODEL_NAME)
 def get_model():
     """
     Get the global model instance, ensuring it's loaded
+    
+    Returns the small/large cascade instead when CASCADE_ENABLED is set.
     """
+    if settings.CASCADE_ENABLED:
+        from app.models.cascade import get_cascade_model
+        cascade = get_cascade_model()
+        cascade.ensure_model_loaded()
+        return cascade
+    
     model.ensure_model_loaded()
     return model
\ No newline at end of file
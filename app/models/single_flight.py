@@ -0,0 +1,72 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Hashable
+
+from starlette.concurrency import run_in_threadpool
+from prometheus_client import Counter, Gauge
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Metrics for request coalescing
+coalesced_requests_counter = Counter(
+    'model_coalesced_requests_total',
+    'Requests attached to an identical in-flight prediction'
+)
+inflight_predictions_gauge = Gauge(
+    'model_inflight_predictions',
+    'Distinct predictions currently in flight'
+)
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into a single execution
+
+    The first caller for a key schedules the work in the threadpool; callers
+    arriving while it is still running await the same result instead of
+    scheduling duplicate work.
+    """
+    def __init__(self):
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def inflight(self) -> int:
+        return len(self._pending)
+
+    async def run(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run ``fn`` for ``key``, or join the call already in flight for it
+
+        Args:
+            key: Identity of the request, e.g. (text, entity_type)
+            fn: Blocking function to run in the threadpool
+
+        Returns:
+            Result of ``fn``, shared by all coalesced callers
+        """
+        task = self._pending.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(fn, *args, **kwargs))
+            self._pending[key] = task
+            inflight_predictions_gauge.inc()
+            task.add_done_callback(lambda t: self._complete(key, t))
+        else:
+            coalesced_requests_counter.inc()
+
+        # Shield so one caller disconnecting does not cancel the others
+        return await asyncio.shield(task)
+
+    def _complete(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._pending.get(key) is task:
+            del self._pending[key]
+            inflight_predictions_gauge.dec()
+
+        # Mark the exception retrieved in case every caller went away
+        if not task.cancelled():
+            task.exception()
+
+
+# Global coalescer for model predictions
+prediction_coalescer = SingleFlight()
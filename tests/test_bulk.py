@@ -0,0 +1,199 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.models.bulk import (
+    ARROW_STREAM_MEDIA_TYPE,
+    BulkInputError,
+    extract_table,
+    read_ipc_stream,
+    write_ipc_stream,
+)
+from app.models.memory import MemoryBudgetExceeded
+from app.models.ner_model import GLiNERModel, get_model
+
+
+def fake_predict_batch(texts, entity_types):
+    """
+    Tag the first word of each text with the requested label
+    """
+    return [
+        [{"text": text.split()[0], "start": 0, "end": len(text.split()[0]), "entity_type": label, "score": 0.9}]
+        for text, label in zip(texts, entity_types)
+    ]
+
+
+class TestBulkExtraction(unittest.TestCase):
+    """
+    Test cases for Arrow bulk extraction
+    """
+
+    def setUp(self):
+        """
+        Set up a mock model with a batched predict
+        """
+        self.mock_model = MagicMock(spec=GLiNERModel)
+        self.mock_model.predict_batch.side_effect = fake_predict_batch
+
+    def test_extract_table_with_labels_column(self):
+        """
+        Test one output row per entity across per-row label lists
+        """
+        table = pa.table({
+            "doc_id": pa.array(["a", "b"]),
+            "text": ["Alice went home", "Paris is big"],
+            "labels": [["person", "location"], ["location"]],
+        })
+
+        result = extract_table(self.mock_model, table)
+
+        self.assertEqual(result.column_names, ["doc_id", "start", "end", "label", "score"])
+        self.assertEqual(result.column("doc_id").to_pylist(), ["a", "a", "b"])
+        self.assertEqual(result.column("label").to_pylist(), ["person", "location", "location"])
+        self.assertEqual(result.schema.field("start").type, pa.int32())
+        self.mock_model.predict_batch.assert_called_once_with(
+            ["Alice went home", "Alice went home", "Paris is big"],
+            ["person", "location", "location"]
+        )
+
+    def test_extract_table_with_default_entity_type(self):
+        """
+        Test rows without a labels column use the entity_type and row index
+        """
+        table = pa.table({"text": ["Alice went home", "Bob stayed"]})
+
+        result = extract_table(self.mock_model, table, entity_type="person")
+
+        self.assertEqual(result.column("doc_id").to_pylist(), [0, 1])
+        self.assertEqual(result.column("label").to_pylist(), ["person", "person"])
+
+    def test_extract_table_requires_text_column(self):
+        """
+        Test that a missing text column is rejected
+        """
+        with self.assertRaises(BulkInputError):
+            extract_table(self.mock_model, pa.table({"body": ["Alice"]}), entity_type="person")
+
+    def test_extract_table_decodes_dictionary_and_view_text(self):
+        """
+        Test that dictionary-encoded and string view text columns are accepted
+        """
+        table = pa.table({
+            "text": pa.array(["Alice went home", "Alice went home"]).dictionary_encode(),
+            "labels": pa.array(["person", "location"]).dictionary_encode(),
+        })
+        result = extract_table(self.mock_model, table)
+        self.assertEqual(result.column("label").to_pylist(), ["person", "location"])
+
+        table = pa.table({"text": pa.array(["Bob stayed", None], type=pa.string_view())})
+        result = extract_table(self.mock_model, table, entity_type="person")
+        self.assertEqual(result.column("doc_id").to_pylist(), [0])
+
+    def test_extract_table_rejects_non_string_columns(self):
+        """
+        Test that text and labels columns of other types are rejected as bad input
+        """
+        with self.assertRaises(BulkInputError):
+            extract_table(self.mock_model, pa.table({"text": [1, 2]}), entity_type="person")
+        with self.assertRaises(BulkInputError):
+            extract_table(self.mock_model, pa.table({"text": ["Alice"], "labels": [1]}))
+
+        self.mock_model.predict_batch.assert_not_called()
+
+    def test_ipc_round_trip(self):
+        """
+        Test Arrow IPC stream serialization
+        """
+        table = pa.table({"text": ["Alice went home"]})
+        self.assertTrue(read_ipc_stream(write_ipc_stream(table)).equals(table))
+
+    def test_bulk_endpoint(self):
+        """
+        Test the bulk endpoint returns entities as an Arrow IPC stream
+        """
+        app.dependency_overrides[get_model] = lambda: self.mock_model
+        try:
+            response = TestClient(app).post(
+                "/api/v1/bulk/predict?entity_type=person",
+                content=write_ipc_stream(pa.table({"text": ["Alice went home"]})),
+                headers={"Content-Type": ARROW_STREAM_MEDIA_TYPE, "X-API-Key": settings.API_KEY}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        self.assertEqual(response.status_code, 200)
+        result = read_ipc_stream(response.content)
+        self.assertEqual(result.column("label").to_pylist(), ["person"])
+
+    def test_bulk_endpoint_invalid_stream(self):
+        """
+        Test that a body that is not an Arrow stream is rejected
+        """
+        app.dependency_overrides[get_model] = lambda: self.mock_model
+        try:
+            response = TestClient(app).post(
+                "/api/v1/bulk/predict",
+                content=b"not arrow",
+                headers={"X-API-Key": settings.API_KEY}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_extract_table_rejects_too_many_pairs(self):
+        """
+        Test that the pair limit is enforced before any prediction
+        """
+        table = pa.table({"text": ["Alice", "Bob", ""], "labels": [["person", "location"], ["person"], ["person"]]})
+
+        with patch.object(settings, "BULK_MAX_ROWS", 2):
+            with self.assertRaises(BulkInputError):
+                extract_table(self.mock_model, table)
+        with patch.object(settings, "BULK_MAX_ROWS", 3):
+            extract_table(self.mock_model, table)
+
+        self.mock_model.predict_batch.assert_called_once()
+
+    def test_bulk_endpoint_rejects_oversized_body(self):
+        """
+        Test that bodies over BULK_MAX_BODY_MB are rejected before parsing
+        """
+        app.dependency_overrides[get_model] = lambda: self.mock_model
+        try:
+            with patch.object(settings, "BULK_MAX_BODY_MB", 1):
+                response = TestClient(app).post(
+                    "/api/v1/bulk/predict?entity_type=person",
+                    content=b"x" * (1024 * 1024 + 1),
+                    headers={"X-API-Key": settings.API_KEY}
+                )
+        finally:
+            app.dependency_overrides.clear()
+
+        self.assertEqual(response.status_code, 413)
+        self.mock_model.predict_batch.assert_not_called()
+
+    def test_bulk_endpoint_over_memory_budget(self):
+        """
+        Test that a text over the memory budget is rejected with 413
+        """
+        self.mock_model.predict_batch.side_effect = MemoryBudgetExceeded("over budget")
+        app.dependency_overrides[get_model] = lambda: self.mock_model
+        try:
+            response = TestClient(app).post(
+                "/api/v1/bulk/predict?entity_type=person",
+                content=write_ipc_stream(pa.table({"text": ["Alice went home"]})),
+                headers={"X-API-Key": settings.API_KEY}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        self.assertEqual(response.status_code, 413)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from app.models import cascade
+from app.models.cascade import CascadeModel, chunk_text
+from app.models.ner_model import GLiNERModel
+
+
+class TestCascadeModel(unittest.TestCase):
+    """
+    Test cases for the small/large model cascade
+    """
+
+    def setUp(self):
+        """
+        Set up mock tiers
+        """
+        self.small_model = MagicMock(spec=GLiNERModel)
+        self.large_model = MagicMock(spec=GLiNERModel)
+        self.large_model.predict.return_value = [
+            {"text": "Microsoft", "start": 10, "end": 19, "entity_type": "ORGANIZATION", "score": 0.97}
+        ]
+        self.cascade = CascadeModel(
+            self.small_model,
+            self.large_model,
+            confidence_margin=0.8,
+            chunk_size=0
+        )
+
+    def test_confident_small_model_is_accepted(self):
+        """
+        Test that confident small-model output is returned without escalation
+        """
+        self.small_model.predict.return_value = [
+            {"text": "Microsoft", "start": 10, "end": 19, "entity_type": "ORGANIZATION", "score": 0.9}
+        ]
+
+        entities = self.cascade.predict("I work at Microsoft.", "ORGANIZATION")
+
+        self.assertEqual(entities[0]["score"], 0.9)
+        self.large_model.predict.assert_not_called()
+
+    def test_uncertain_small_model_escalates(self):
+        """
+        Test that low-confidence small-model output escalates to the large model
+        """
+        self.small_model.predict.return_value = [
+            {"text": "Microsoft", "start": 10, "end": 19, "entity_type": "ORGANIZATION", "score": 0.5}
+        ]
+
+        entities = self.cascade.predict("I work at Microsoft.", "ORGANIZATION")
+
+        self.assertEqual(entities[0]["score"], 0.97)
+        self.large_model.predict.assert_called_once_with("I work at Microsoft.", "ORGANIZATION")
+
+    def test_only_uncertain_chunks_escalate(self):
+        """
+        Test per-chunk escalation and offset re-basing
+        """
+        self.cascade.chunk_size = 10
+        self.small_model.predict.side_effect = [
+            [],
+            [{"text": "Bob", "start": 0, "end": 3, "entity_type": "PERSON", "score": 0.4}],
+        ]
+        self.large_model.predict.return_value = [
+            {"text": "Bob", "start": 0, "end": 3, "entity_type": "PERSON", "score": 0.95}
+        ]
+
+        entities = self.cascade.predict("Hello and Bob went", "PERSON")
+
+        self.large_model.predict.assert_called_once_with("Bob went", "PERSON")
+        self.assertEqual(entities[0]["start"], 10)
+        self.assertEqual(entities[0]["end"], 13)
+
+    def test_chunk_text(self):
+        """
+        Test that chunks cover the text and break on whitespace
+        """
+        text = "alpha beta gamma delta"
+        chunks = chunk_text(text, 11)
+
+        self.assertEqual("".join(chunk for _, chunk in chunks), text)
+        for offset, chunk in chunks:
+            self.assertEqual(text[offset:offset + len(chunk)], chunk)
+        self.assertEqual(chunk_text(text, 0), [(0, text)])
+
+
+class TestGetCascadeModel(unittest.TestCase):
+    """
+    Test cases for creating the global cascade
+    """
+
+    def setUp(self):
+        """
+        Reset the global cascade
+        """
+        self.cascade_patcher = patch.object(cascade, "_cascade_model", None)
+        self.cascade_patcher.start()
+
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        self.cascade_patcher.stop()
+
+    def test_concurrent_first_requests_share_one_cascade(self):
+        """
+        Test that concurrent first calls build a single cascade and small model
+        """
+        def slow_model(name):
+            time.sleep(0.05)
+            model = MagicMock(spec=GLiNERModel)
+            model.model_name = name
+            return model
+
+        with patch.object(cascade, "GLiNERModel", side_effect=slow_model) as mock_model_class:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(lambda _: cascade.get_cascade_model(), range(4)))
+
+        self.assertTrue(all(result is results[0] for result in results))
+        mock_model_class.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import torch
+
+from app.models import execution
+
+
+class TestExecution(unittest.TestCase):
+    """
+    Test cases for the torch execution tuning helpers
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary directory for fake cgroup files
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        self.tmp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmp_dir.name, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return path
+
+    def test_cgroup_v2_cpu_limit(self):
+        """
+        Test reading a cgroup v2 CPU quota
+        """
+        cpu_max = self._write("cpu.max", "200000 100000\n")
+        with patch.object(execution, "CGROUP_V2_CPU_MAX", cpu_max):
+            self.assertEqual(execution.get_cgroup_cpu_limit(), 2.0)
+
+    def test_cgroup_v2_unlimited(self):
+        """
+        Test an unlimited cgroup v2 CPU quota
+        """
+        cpu_max = self._write("cpu.max", "max 100000\n")
+        with patch.object(execution, "CGROUP_V2_CPU_MAX", cpu_max):
+            self.assertIsNone(execution.get_cgroup_cpu_limit())
+
+    def test_cgroup_v1_cpu_limit(self):
+        """
+        Test reading a cgroup v1 CPU quota
+        """
+        quota = self._write("cpu.cfs_quota_us", "150000")
+        period = self._write("cpu.cfs_period_us", "100000")
+        with patch.object(execution, "CGROUP_V2_CPU_MAX", "/nonexistent"), \
+                patch.object(execution, "CGROUP_V1_CPU_QUOTA", quota), \
+                patch.object(execution, "CGROUP_V1_CPU_PERIOD", period):
+            self.assertEqual(execution.get_cgroup_cpu_limit(), 1.5)
+
+    def test_available_cpus_respects_quota(self):
+        """
+        Test that the CPU quota caps the number of usable CPUs
+        """
+        with patch.object(execution, "get_cgroup_cpu_limit", return_value=1.5):
+            self.assertLessEqual(execution.get_available_cpus(), 2)
+
+    def test_bucket_length(self):
+        """
+        Test rounding sequence lengths up to buckets
+        """
+        buckets = [32, 64, 128]
+        self.assertEqual(execution.bucket_length(10, buckets), 32)
+        self.assertEqual(execution.bucket_length(64, buckets), 64)
+        self.assertEqual(execution.bucket_length(65, buckets), 128)
+        self.assertEqual(execution.bucket_length(500, buckets), 500)
+
+    def test_batch_size_buckets(self):
+        """
+        Test the batch sizes compiled models are warmed up for
+        """
+        self.assertEqual(execution.batch_size_buckets(16), [1, 2, 4, 8, 16])
+        self.assertEqual(execution.batch_size_buckets(12), [1, 2, 4, 8, 12])
+        self.assertEqual(execution.batch_size_buckets(1), [1])
+
+    def test_pad_batch(self):
+        """
+        Test padding a batch up to a fixed number of rows
+        """
+        inputs = {
+            "input_ids": torch.tensor([[1, 2], [3, 4], [5, 6]]),
+            "attention_mask": torch.ones(3, 2, dtype=torch.long),
+        }
+        padded = execution.pad_batch(inputs, 4)
+
+        self.assertEqual(padded["input_ids"].shape, (4, 2))
+        self.assertTrue(torch.equal(padded["input_ids"][3], inputs["input_ids"][2]))
+        self.assertIs(execution.pad_batch(inputs, 3), inputs)
+
+    def test_warmup_covers_batch_buckets(self):
+        """
+        Test that warmup runs every (batch size, sequence bucket) shape within budget
+        """
+        model = MagicMock()
+        with patch.object(execution, "build_example_inputs", return_value={}) as mock_inputs, \
+                patch.object(execution, "fits_memory_budget", side_effect=lambda length, batch: length * batch <= 128):
+            execution.warmup(model, MagicMock(), "cpu", [32, 64], [1, 2, 4])
+
+        shapes = [call.args[2:] for call in mock_inputs.call_args_list]
+        self.assertEqual(shapes, [(32, 1), (64, 1), (32, 2), (64, 2), (32, 4)])
+
+    def test_compile_warmup_stays_within_recompile_limit(self):
+        """
+        Test that a small real model compiles every warmed-up shape without falling back to eager
+        """
+        from torch._dynamo.utils import counters
+        from transformers import BertConfig, BertForTokenClassification, BertTokenizerFast
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            vocab_file = os.path.join(tmp_dir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", "find", "entity", "in", ":", "warm", "up"]))
+            tokenizer = BertTokenizerFast(vocab_file)
+
+        model = BertForTokenClassification(BertConfig(
+            vocab_size=tokenizer.vocab_size,
+            hidden_size=16,
+            num_hidden_layers=1,
+            num_attention_heads=2,
+            intermediate_size=32,
+            max_position_embeddings=64
+        )).eval()
+
+        # 3 sequence buckets x 3 batch sizes is over torch's default limit of 8
+        buckets = [8, 16, 32]
+        torch._dynamo.reset()
+        counters.clear()
+        dynamo_config = torch._dynamo.config
+        limit_name = "recompile_limit" if hasattr(dynamo_config, "recompile_limit") else "cache_size_limit"
+        compile_fn = torch.compile
+
+        with patch.object(dynamo_config, limit_name, 8), \
+                patch.object(execution.settings, "TORCH_EXECUTION_MODE", "compile"), \
+                patch.object(execution.settings, "SEQUENCE_LENGTH_BUCKETS", buckets), \
+                patch.object(execution.settings, "BULK_BATCH_SIZE", 4), \
+                patch.object(execution.settings, "MEMORY_REQUEST_BUDGET_MB", None), \
+                patch.object(torch, "compile", lambda model, **kwargs: compile_fn(model, backend="eager", **kwargs)):
+            runtime_model, mode = execution.prepare_runtime_model(model, tokenizer, "cpu")
+
+        torch._dynamo.reset()
+
+        self.assertEqual(mode, "compile")
+        self.assertEqual(counters["stats"]["unique_graphs"], len(buckets) * 3)
+
+    def test_prepare_runtime_model_eager(self):
+        """
+        Test that eager mode returns the model unchanged
+        """
+        model = MagicMock()
+        with patch.object(execution.settings, "TORCH_EXECUTION_MODE", "eager"):
+            runtime_model, mode = execution.prepare_runtime_model(model, MagicMock(), "cpu")
+
+        self.assertIs(runtime_model, model)
+        self.assertEqual(mode, "eager")
+
+    def test_prepare_runtime_model_falls_back_on_parity_failure(self):
+        """
+        Test fallback to eager mode when the optimized model output differs
+        """
+        model = MagicMock()
+        with patch.object(execution.settings, "TORCH_EXECUTION_MODE", "compile"), \
+                patch.object(execution, "optimize_model", return_value=MagicMock()), \
+                patch.object(execution, "warmup"), \
+                patch.object(execution, "check_parity", return_value=False):
+            runtime_model, mode = execution.prepare_runtime_model(model, MagicMock(), "cpu")
+
+        self.assertIs(runtime_model, model)
+        self.assertEqual(mode, "eager")
+
+    def test_prepare_runtime_model_falls_back_on_error(self):
+        """
+        Test fallback to eager mode when optimization raises
+        """
+        model = MagicMock()
+        with patch.object(execution.settings, "TORCH_EXECUTION_MODE", "torchscript"), \
+                patch.object(execution, "optimize_model", side_effect=RuntimeError("trace failed")):
+            runtime_model, mode = execution.prepare_runtime_model(model, MagicMock(), "cpu")
+
+        self.assertIs(runtime_model, model)
+        self.assertEqual(mode, "eager")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import MagicMock
+
+from app.models.incremental import IncrementalExtractor, segment_document
+from app.models.label_cache import compute_cache_version
+from app.models.ner_model import GLiNERModel
+
+
+class TestIncrementalExtractor(unittest.TestCase):
+    """
+    Test cases for incremental re-extraction of edited documents
+    """
+
+    def setUp(self):
+        """
+        Set up a mock model that tags the first word of each segment
+        """
+        self.mock_model = MagicMock(spec=GLiNERModel)
+        self.mock_model.model_name = "urchade/gliner_medium-v2.1"
+        self.mock_model.version = compute_cache_version(self.mock_model.model_name, "abc123")
+        self.mock_model.predict.side_effect = lambda text, entity_type: [
+            {
+                "text": text.split()[0],
+                "start": 0,
+                "end": len(text.split()[0]),
+                "entity_type": entity_type,
+                "score": 0.9
+            }
+        ]
+        self.extractor = IncrementalExtractor(self.mock_model, max_entries=100)
+
+    def test_segment_document(self):
+        """
+        Test sentence and paragraph segmentation with offsets
+        """
+        text = "Alice went home. Bob stayed.\n\nCarol left"
+        segments = segment_document(text)
+
+        self.assertEqual(
+            [segment for _, segment in segments],
+            ["Alice went home.", "Bob stayed.", "Carol left"]
+        )
+        for offset, segment in segments:
+            self.assertEqual(text[offset:offset + len(segment)], segment)
+
+    def test_only_changed_segments_are_recomputed(self):
+        """
+        Test that an edit only re-runs the model on the changed sentence
+        """
+        self.extractor.predict("Alice went home. Bob stayed.", "PERSON")
+        self.assertEqual(self.mock_model.predict.call_count, 2)
+
+        self.mock_model.predict.reset_mock()
+        entities = self.extractor.predict("Alice went home. Dave arrived. Bob stayed.", "PERSON")
+
+        self.mock_model.predict.assert_called_once_with("Dave arrived.", "PERSON")
+        self.assertEqual([entity["text"] for entity in entities], ["Alice", "Dave", "Bob"])
+
+    def test_offsets_are_rebased(self):
+        """
+        Test that cached entities are re-based into the new document
+        """
+        self.extractor.predict("Bob stayed.", "PERSON")
+        text = "Alice went home. Bob stayed."
+        entities = self.extractor.predict(text, "PERSON")
+
+        bob = entities[1]
+        self.assertEqual(text[bob["start"]:bob["end"]], "Bob")
+
+    def test_entity_type_is_part_of_cache_key(self):
+        """
+        Test that a different entity type does not reuse cached results
+        """
+        self.extractor.predict("Alice went home.", "PERSON")
+        self.extractor.predict("Alice went home.", "LOCATION")
+
+        self.assertEqual(self.mock_model.predict.call_count, 2)
+
+    def test_model_version_is_part_of_cache_key(self):
+        """
+        Test that a reloaded or changed checkpoint does not reuse cached results
+        """
+        self.extractor.predict("Alice went home.", "PERSON")
+        self.mock_model.version = compute_cache_version(self.mock_model.model_name, "def456")
+        self.extractor.predict("Alice went home.", "PERSON")
+
+        self.assertEqual(self.mock_model.predict.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import torch
+
+from app.models.label_cache import LabelEmbeddingCache, compute_cache_version
+
+
+class TestLabelEmbeddingCache(unittest.TestCase):
+    """
+    Test cases for the bi-encoder label embedding cache
+    """
+
+    def setUp(self):
+        """
+        Set up a temporary cache directory and a fake label encoder
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.version = compute_cache_version("urchade/gliner_medium-v2.1", "abc123")
+        self.encode_fn = MagicMock(side_effect=lambda labels: torch.randn(len(labels), 8))
+
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        self.tmp_dir.cleanup()
+
+    def test_labels_are_encoded_once(self):
+        """
+        Test that cached labels are not re-encoded
+        """
+        cache = LabelEmbeddingCache("urchade/gliner_medium-v2.1", self.version)
+
+        first = cache.get_many(["person", "location"], self.encode_fn)
+        second = cache.get_many(["location", "person", "organization"], self.encode_fn)
+
+        self.assertEqual(first.shape, (2, 8))
+        self.assertEqual(second.shape, (3, 8))
+        self.assertTrue(torch.equal(first[0], second[1]))
+        self.assertEqual(self.encode_fn.call_count, 2)
+        self.encode_fn.assert_called_with(["organization"])
+
+    def test_cache_persists_across_instances(self):
+        """
+        Test that embeddings are reloaded from the cache directory
+        """
+        cache = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1", self.version, self.tmp_dir.name, vocabulary=["person"]
+        )
+        embeddings = cache.get_many(["person"], self.encode_fn)
+
+        reloaded = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1", self.version, self.tmp_dir.name, vocabulary=["person"]
+        )
+        self.assertEqual(reloaded.load(), 1)
+        self.assertTrue(torch.equal(reloaded.get_many(["person"], self.encode_fn), embeddings))
+        self.assertEqual(self.encode_fn.call_count, 1)
+
+    def test_new_version_ignores_old_cache(self):
+        """
+        Test that a different model revision does not reuse stale embeddings
+        """
+        cache = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1", self.version, self.tmp_dir.name, vocabulary=["person"]
+        )
+        cache.get_many(["person"], self.encode_fn)
+
+        new_version = compute_cache_version("urchade/gliner_medium-v2.1", "def456")
+        self.assertNotEqual(new_version, self.version)
+
+        reloaded = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1", new_version, self.tmp_dir.name, vocabulary=["person"]
+        )
+        self.assertEqual(reloaded.load(), 0)
+
+    def test_extra_labels_are_bounded_and_not_persisted(self):
+        """
+        Test that labels outside the vocabulary stay in a bounded in-memory LRU
+        """
+        cache = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1",
+            self.version,
+            self.tmp_dir.name,
+            vocabulary=["person"],
+            max_extra_labels=2
+        )
+        cache.get_many(["person"], self.encode_fn)
+
+        with patch.object(cache, "save") as mock_save:
+            cache.get_many(["a", "b"], self.encode_fn)
+            cache.get_many(["a"], self.encode_fn)
+            cache.get_many(["c"], self.encode_fn)
+
+        mock_save.assert_not_called()
+        self.assertEqual(list(cache.extra_embeddings), ["a", "c"])
+        self.assertEqual(list(cache.embeddings), ["person"])
+
+        reloaded = LabelEmbeddingCache(
+            "urchade/gliner_medium-v2.1", self.version, self.tmp_dir.name, vocabulary=["person"]
+        )
+        self.assertEqual(reloaded.load(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
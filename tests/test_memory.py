@@ -0,0 +1,167 @@
+import signal
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock
+
+import torch
+
+from app.models import memory
+from app.models.memory import MemoryBudgetExceeded, MemoryGuard, fits_memory_budget
+from app.models.ner_model import GLiNERModel
+
+
+class TestMemoryBudget(unittest.TestCase):
+    """
+    Test cases for projected memory budgets
+    """
+
+    def setUp(self):
+        """
+        Set up a 1MB budget at 1KB per token, i.e. 1024 tokens
+        """
+        self.settings_patchers = [
+            patch.object(memory.settings, "MEMORY_BYTES_PER_TOKEN", 1024),
+            patch.object(memory.settings, "MEMORY_REQUEST_BUDGET_MB", 1),
+            patch.object(memory.settings, "MEMORY_SPLIT_OVERSIZED", True),
+            patch.object(memory.settings, "BI_ENCODER_ENABLED", False),
+        ]
+        for patcher in self.settings_patchers:
+            patcher.start()
+
+        # A loaded model whose tokenizer yields one token per character
+        self.ner_model = GLiNERModel("urchade/gliner_medium-v2.1")
+        self.ner_model.is_loaded = True
+        self.ner_model.runtime_model = MagicMock()
+        self.ner_model._tokenize = lambda prompt: {
+            "input_ids": torch.zeros(len(prompt), max(len(p) for p in prompt))
+            if isinstance(prompt, list) else torch.zeros(1, len(prompt))
+        }
+        self.ner_model._process_outputs = MagicMock(side_effect=lambda outputs, inputs, text, entity_type: [
+            {"text": text[:3], "start": 0, "end": 3, "entity_type": entity_type, "score": 0.9}
+        ])
+
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        for patcher in self.settings_patchers:
+            patcher.stop()
+
+    def test_fits_memory_budget(self):
+        """
+        Test the projected memory check against the budget
+        """
+        self.assertTrue(fits_memory_budget(1024))
+        self.assertFalse(fits_memory_budget(1025))
+        self.assertFalse(fits_memory_budget(600, batch_size=2))
+
+        with patch.object(memory.settings, "MEMORY_REQUEST_BUDGET_MB", None):
+            self.assertTrue(fits_memory_budget(10 ** 9))
+
+    def test_small_request_runs_once(self):
+        """
+        Test that a request within budget is not split
+        """
+        self.ner_model.predict("short text", "PERSON")
+        self.ner_model.runtime_model.assert_called_once()
+
+    def test_oversized_request_is_split(self):
+        """
+        Test that an over-budget request is split and offsets re-based
+        """
+        text = " ".join(["word"] * 400)
+        entities = self.ner_model.predict(text, "PERSON")
+
+        self.assertGreater(self.ner_model.runtime_model.call_count, 1)
+        for entity in entities:
+            self.assertEqual(text[entity["start"]:entity["end"]], "wor")
+
+    def test_batch_is_halved_to_fit_budget(self):
+        """
+        Test that batched prediction shrinks batches that exceed the budget
+        """
+        texts = ["x" * 300] * 8
+        results = self.ner_model.predict_batch(texts, ["PERSON"] * 8)
+
+        self.assertEqual(len(results), 8)
+        # 3 texts of ~320 tokens fit in 1024 tokens, so 8 need at least 4 passes
+        self.assertGreaterEqual(self.ner_model.runtime_model.call_count, 4)
+
+    def test_compiled_batches_are_padded_to_bucket(self):
+        """
+        Test that compiled models only see warmed-up batch sizes
+        """
+        self.ner_model.execution_mode = "compile"
+        self.ner_model._tokenize = lambda prompt: {
+            "input_ids": torch.zeros(len(prompt), 8),
+            "attention_mask": torch.ones(len(prompt), 8),
+        }
+
+        results = self.ner_model.predict_batch(["text"] * 3, ["PERSON"] * 3)
+
+        self.assertEqual(len(results), 3)
+        inputs = self.ner_model.runtime_model.call_args.kwargs
+        self.assertEqual(inputs["input_ids"].shape[0], 4)
+
+    def test_oversized_request_is_rejected_without_split(self):
+        """
+        Test that an over-budget request is rejected when splitting is disabled
+        """
+        with patch.object(memory.settings, "MEMORY_SPLIT_OVERSIZED", False):
+            with self.assertRaises(MemoryBudgetExceeded):
+                self.ner_model.predict("x" * 2000, "PERSON")
+
+        self.ner_model.runtime_model.assert_not_called()
+
+
+class TestTrackMemory(unittest.TestCase):
+    """
+    Test cases for process-level memory accounting
+    """
+
+    def test_overlapping_sections_share_one_cuda_peak_window(self):
+        """
+        Test that concurrent forward passes do not reset each other's CUDA peak
+        """
+        mock_torch = MagicMock()
+        mock_torch.cuda.is_available.return_value = True
+        mock_torch.cuda.max_memory_allocated.return_value = 1024
+
+        with patch.object(memory, "torch", mock_torch):
+            with memory.track_memory("request"):
+                with memory.track_memory("request"):
+                    pass
+                mock_torch.cuda.max_memory_allocated.assert_not_called()
+
+        mock_torch.cuda.reset_peak_memory_stats.assert_called_once()
+        mock_torch.cuda.max_memory_allocated.assert_called_once()
+
+
+class TestMemoryGuard(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for memory-based worker recycling
+    """
+
+    async def test_below_threshold_does_not_drain(self):
+        """
+        Test that the worker keeps serving below the threshold
+        """
+        guard = MemoryGuard(threshold_mb=10 ** 6, drain_seconds=0)
+        self.assertFalse(guard.check())
+
+    async def test_above_threshold_drains_and_recycles(self):
+        """
+        Test that crossing the threshold drains then sends SIGTERM
+        """
+        guard = MemoryGuard(threshold_mb=1, drain_seconds=0)
+
+        with patch.object(memory.os, "kill") as mock_kill:
+            self.assertTrue(guard.check())
+            self.assertTrue(guard.check())
+            await asyncio.sleep(0.01)
+
+        mock_kill.assert_called_once_with(memory.os.getpid(), signal.SIGTERM)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 from unittest.mock import patch, MagicMock
 import torch
 
+from app.core.config import settings
+from app.models.memory import MemoryBudgetExceeded
 from app.models.ner_model import GLiNERModel
 
 
@@ -142,5 +144,158 @@ class TestNERModel(unittest.TestCase):
         # and would require more detailed testing of the _process_outputs method
 
 
+class TestBiEncoder(unittest.TestCase):
+    """
+    Test cases for serving bi-encoder GLiNER checkpoints
+    """
+    
+    def setUp(self):
+        """
+        Set up a mock gliner package with a bi-encoder checkpoint
+        """
+        self.settings_patchers = [
+            patch.object(settings, "BI_ENCODER_ENABLED", True),
+            patch.object(settings, "LABEL_VOCABULARY", ["person"]),
+            patch.object(settings, "MODEL_CACHE_DIR", None),
+        ]
+        for patcher in self.settings_patchers:
+            patcher.start()
+        
+        self.gliner_patcher = patch('app.models.ner_model.gliner')
+        self.mock_gliner = self.gliner_patcher.start()
+        
+        self.mock_bi_encoder = MagicMock()
+        self.mock_bi_encoder.config.labels_encoder = "BAAI/bge-small-en-v1.5"
+        self.mock_bi_encoder.config._commit_hash = "abc123"
+        self.mock_bi_encoder.data_processor.transformer_tokenizer = MagicMock(
+            side_effect=lambda text: {"input_ids": list(range(len(text.split())))}
+        )
+        self.mock_bi_encoder.encode_labels.side_effect = lambda labels: torch.randn(len(labels), 8)
+        self.mock_bi_encoder.predict_with_embeds.side_effect = (
+            lambda text, embeddings, labels, threshold: [
+                {"text": "Alice", "start": 0, "end": 5, "label": labels[0], "score": 0.91}
+            ]
+        )
+        self.mock_gliner.GLiNER.from_pretrained.return_value = self.mock_bi_encoder
+        
+        self.ner_model = GLiNERModel("knowledgator/gliner-bi-small-v1.0")
+    
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        self.gliner_patcher.stop()
+        for patcher in self.settings_patchers:
+            patcher.stop()
+    
+    def test_load_precomputes_vocabulary(self):
+        """
+        Test that the label vocabulary is encoded by the checkpoint's label encoder at load
+        """
+        self.ner_model.load_model()
+        
+        self.assertIs(self.ner_model.bi_encoder, self.mock_bi_encoder)
+        self.assertIsNone(self.ner_model.model)
+        self.mock_bi_encoder.encode_labels.assert_called_once_with(["person"])
+    
+    def test_uni_encoder_checkpoint_rejected(self):
+        """
+        Test that BI_ENCODER_ENABLED refuses checkpoints without a label encoder
+        """
+        self.mock_bi_encoder.config.labels_encoder = None
+        
+        with self.assertRaises(RuntimeError) as context:
+            self.ner_model.load_model()
+        
+        self.assertIn("not a bi-encoder", str(context.exception))
+        self.assertFalse(self.ner_model.is_loaded)
+    
+    def test_label_cache_version_without_revision(self):
+        """
+        Test that checkpoints without a commit hash version the label cache by their weights
+        """
+        self.mock_bi_encoder.config._commit_hash = None
+        token_rep_layer = self.mock_bi_encoder.model.token_rep_layer
+        token_rep_layer.labels_encoder = torch.nn.Linear(4, 4)
+        token_rep_layer.labels_projection = None
+        
+        self.ner_model.load_model()
+        version = self.ner_model.label_cache.version
+        
+        # Reloading the same weights keeps persisted embeddings usable
+        self.ner_model.load_model()
+        self.assertEqual(self.ner_model.label_cache.version, version)
+        
+        # Changed weights under the same path must not reuse them
+        with torch.no_grad():
+            token_rep_layer.labels_encoder.weight.add_(1.0)
+        self.ner_model.load_model()
+        self.assertNotEqual(self.ner_model.label_cache.version, version)
+    
+    def test_predict_labels_uses_span_scorer(self):
+        """
+        Test that predictions come from the span scorer with cached label embeddings
+        """
+        self.ner_model.load_model()
+        
+        entities = self.ner_model.predict_labels("Alice went home", ["person", "location"])
+        
+        self.assertEqual(entities, [
+            {"text": "Alice", "start": 0, "end": 5, "entity_type": "person", "score": 0.91}
+        ])
+        _, embeddings, labels = self.mock_bi_encoder.predict_with_embeds.call_args[0]
+        self.assertEqual(embeddings.shape, (2, 8))
+        self.assertEqual(labels, ["person", "location"])
+        # Only the label missing from the vocabulary is encoded on the request path
+        self.mock_bi_encoder.encode_labels.assert_called_with(["location"])
+    
+    def test_predict_labels_splits_oversized_text(self):
+        """
+        Test that an over-budget text is split and offsets re-based
+        """
+        self.ner_model.load_model()
+        self.mock_bi_encoder.predict_with_embeds.side_effect = (
+            lambda text, embeddings, labels, threshold: [
+                {"text": text[:5], "start": 0, "end": 5, "label": labels[0], "score": 0.91}
+            ]
+        )
+        text = " ".join(["Alice"] * 2000)
+        
+        # 1MB at 1KB per token fits 1024 tokens, one token per word here
+        with patch.object(settings, "MEMORY_BYTES_PER_TOKEN", 1024):
+            with patch.object(settings, "MEMORY_REQUEST_BUDGET_MB", 1):
+                entities = self.ner_model.predict_labels(text, ["person"])
+                
+                with patch.object(settings, "MEMORY_SPLIT_OVERSIZED", False):
+                    with self.assertRaises(MemoryBudgetExceeded):
+                        self.ner_model.predict_labels(text, ["person"])
+        
+        self.assertGreater(len(entities), 1)
+        for entity in entities:
+            self.assertEqual(text[entity["start"]:entity["end"]], entity["text"])
+    
+    def test_predict_batch_encodes_each_text_once(self):
+        """
+        Test that bulk pairs sharing a text are scored in one bi-encoder pass
+        """
+        self.ner_model.load_model()
+        self.mock_bi_encoder.predict_with_embeds.side_effect = (
+            lambda text, embeddings, labels, threshold: [
+                {"text": text, "start": 0, "end": len(text), "label": label, "score": 0.9}
+                for label in labels
+            ]
+        )
+        
+        results = self.ner_model.predict_batch(
+            ["Alice", "Alice", "Paris"],
+            ["person", "location", "location"]
+        )
+        
+        self.assertEqual(self.mock_bi_encoder.predict_with_embeds.call_count, 2)
+        self.assertEqual([[entity["entity_type"] for entity in entities] for entities in results], [
+            ["person"], ["location"], ["location"]
+        ])
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
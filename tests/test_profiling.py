@@ -0,0 +1,162 @@
+import io
+import asyncio
+import zipfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import torch
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.config import settings
+from app.core.profiling import ProfileSession, Profiler, ProfilerBusy
+
+
+class TestProfiler(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for on-demand profiling sessions
+    """
+
+    def setUp(self):
+        """
+        Set up a profiler and a tiny model to profile
+        """
+        self.profiler = Profiler()
+        self.model = torch.nn.Linear(8, 2)
+
+    def _forward(self):
+        with self.profiler.profile_forward():
+            self.model(torch.randn(4, 8))
+
+    async def _run_forwards(self, count):
+        for _ in range(count):
+            await asyncio.sleep(0.05)
+            await asyncio.to_thread(self._forward)
+
+    async def test_capture_stops_after_request_budget(self):
+        """
+        Test that a session ends after N forward passes and returns an archive
+        """
+        capture = asyncio.ensure_future(self.profiler.capture(max_requests=2, max_seconds=10))
+        await self._run_forwards(3)
+        artifact = await capture
+
+        with zipfile.ZipFile(io.BytesIO(artifact)) as archive:
+            names = archive.namelist()
+            operators = archive.read("operators.txt").decode()
+
+        self.assertIn("summary.json", names)
+        self.assertIn("python_stacks.folded", names)
+        self.assertEqual(len([name for name in names if name.startswith("torch/")]), 2)
+        self.assertIn("aten::", operators)
+        self.assertIsNone(self.profiler.session)
+
+    async def test_capture_stops_after_time_budget(self):
+        """
+        Test that a session with no traffic ends after T seconds
+        """
+        artifact = await self.profiler.capture(max_requests=5, max_seconds=0.2)
+
+        with zipfile.ZipFile(io.BytesIO(artifact)) as archive:
+            self.assertFalse([name for name in archive.namelist() if name.startswith("torch/")])
+
+    async def test_concurrent_sessions_rejected(self):
+        """
+        Test that only one session runs at a time
+        """
+        capture = asyncio.ensure_future(self.profiler.capture(max_requests=1, max_seconds=0.3))
+        await asyncio.sleep(0.05)
+
+        with self.assertRaises(ProfilerBusy):
+            await self.profiler.capture(max_requests=1, max_seconds=0.3)
+
+        await capture
+
+    def test_trace_export_deferred_to_artifact(self):
+        """
+        Test that traces are exported when the artifact is built, not on the request path
+        """
+        session = ProfileSession(max_requests=1, max_seconds=10, sample_interval=0.01)
+        prof = MagicMock()
+        prof.export_chrome_trace.side_effect = lambda path: open(path, "w").write("{}")
+        prof.key_averages.return_value = []
+
+        session.add_forward(prof)
+        prof.export_chrome_trace.assert_not_called()
+        self.assertTrue(session.done.is_set())
+
+        with zipfile.ZipFile(io.BytesIO(session.build_artifact())) as archive:
+            self.assertEqual(archive.read("torch/forward_000.json"), b"{}")
+
+    def test_no_session_does_not_profile(self):
+        """
+        Test that forward passes run normally without a session
+        """
+        self._forward()
+        self.assertIsNone(self.profiler.session)
+
+
+class TestProfileEndpoint(unittest.TestCase):
+    """
+    Test cases for the admin profiling endpoint
+    """
+
+    def setUp(self):
+        """
+        Set up test client
+        """
+        self.client = TestClient(app)
+
+    def test_disabled_without_admin_key(self):
+        """
+        Test that admin endpoints are disabled unless ADMIN_API_KEY is set
+        """
+        with patch.object(settings, "ADMIN_API_KEY", None):
+            response = self.client.post(
+                "/api/v1/admin/profile",
+                json={"requests": 1, "seconds": 1},
+                headers={"X-API-Key": settings.API_KEY}
+            )
+        self.assertEqual(response.status_code, 403)
+
+    def test_regular_api_key_rejected(self):
+        """
+        Test that the regular API key does not grant admin access
+        """
+        with patch.object(settings, "ADMIN_API_KEY", "admin-secret"):
+            response = self.client.post(
+                "/api/v1/admin/profile",
+                json={"requests": 1, "seconds": 1},
+                headers={"X-API-Key": settings.API_KEY}
+            )
+        self.assertEqual(response.status_code, 403)
+
+    def test_limits_enforced(self):
+        """
+        Test that captures above the configured limits are rejected
+        """
+        with patch.object(settings, "ADMIN_API_KEY", "admin-secret"):
+            response = self.client.post(
+                "/api/v1/admin/profile",
+                json={"requests": settings.PROFILE_MAX_REQUESTS + 1, "seconds": 1},
+                headers={"X-API-Key": "admin-secret"}
+            )
+        self.assertEqual(response.status_code, 400)
+
+    def test_capture_returns_zip(self):
+        """
+        Test that a capture returns a downloadable archive
+        """
+        with patch.object(settings, "ADMIN_API_KEY", "admin-secret"):
+            response = self.client.post(
+                "/api/v1/admin/profile",
+                json={"requests": 1, "seconds": 0.2},
+                headers={"X-API-Key": "admin-secret"}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/zip")
+        self.assertIn("attachment", response.headers["content-disposition"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from app.models.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    """
+    Test cases for in-flight request coalescing
+    """
+
+    async def test_identical_requests_share_one_call(self):
+        """
+        Test that concurrent callers with the same key run the function once
+        """
+        release = threading.Event()
+        fn = MagicMock(side_effect=lambda text: release.wait(5) and [text])
+        single_flight = SingleFlight()
+
+        calls = [
+            asyncio.ensure_future(single_flight.run(("hello", "PERSON"), fn, "hello"))
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.05)
+        self.assertEqual(single_flight.inflight, 1)
+
+        release.set()
+        results = await asyncio.gather(*calls)
+
+        self.assertEqual(fn.call_count, 1)
+        self.assertEqual(results, [["hello"]] * 5)
+        self.assertEqual(single_flight.inflight, 0)
+
+    async def test_different_keys_run_separately(self):
+        """
+        Test that requests with different keys are not coalesced
+        """
+        fn = MagicMock(side_effect=lambda text: [text])
+        single_flight = SingleFlight()
+
+        results = await asyncio.gather(
+            single_flight.run(("a", "PERSON"), fn, "a"),
+            single_flight.run(("b", "PERSON"), fn, "b"),
+        )
+
+        self.assertEqual(fn.call_count, 2)
+        self.assertEqual(results, [["a"], ["b"]])
+
+    async def test_errors_propagate_to_all_callers(self):
+        """
+        Test that a failure is raised to every coalesced caller
+        """
+        release = threading.Event()
+
+        def fail():
+            release.wait(5)
+            raise RuntimeError("Model prediction failed")
+
+        single_flight = SingleFlight()
+        calls = [asyncio.ensure_future(single_flight.run("key", fail)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        release.set()
+
+        results = await asyncio.gather(*calls, return_exceptions=True)
+
+        for result in results:
+            self.assertIsInstance(result, RuntimeError)
+        self.assertEqual(single_flight.inflight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
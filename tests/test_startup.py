@@ -0,0 +1,76 @@
+import os
+import sys
+import json
+import subprocess
+import unittest
+
+# Maximum seconds allowed to import app.main in a fresh interpreter
+APP_IMPORT_BUDGET_SECONDS = float(os.getenv("APP_IMPORT_BUDGET_SECONDS", "2.0"))
+
+# Modules that must stay off the app import path
+LAZY_MODULES = ["torch", "transformers", "pyarrow", "opentelemetry.sdk", "boto3", "google.cloud.storage", "azure.storage.blob"]
+
+IMPORT_SCRIPT = """
+import sys, json, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+from app.core.lazy import import_time_report
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": [m for m in %r if m in sys.modules],
+    "report": import_time_report(app.main._app_import_seconds),
+}))
+""" % (LAZY_MODULES,)
+
+
+class TestStartup(unittest.TestCase):
+    """
+    Test cases for app startup time
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Import the app once in a fresh interpreter so nothing is pre-imported
+        """
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        cls.report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_heavy_modules_are_lazy(self):
+        """
+        Test that heavy and optional dependencies are not imported with the app
+        """
+        self.assertEqual(self.report["loaded"], [])
+
+    def test_report_breaks_down_startup_time(self):
+        """
+        Test that the import time report shows where startup time goes
+        """
+        subsystems = self.report["report"]["subsystems"]
+
+        self.assertIn("fastapi", subsystems)
+        self.assertIn("app.api.endpoints.prediction", subsystems)
+        self.assertLessEqual(sum(subsystems.values()), self.report["report"]["app_import_seconds"] + 0.01)
+
+    def test_import_time_budget(self):
+        """
+        Test that importing the app stays within the startup budget
+        """
+        self.assertLess(
+            self.report["seconds"],
+            APP_IMPORT_BUDGET_SECONDS,
+            f"app.main import took {self.report['seconds']:.2f}s, "
+            f"over the {APP_IMPORT_BUDGET_SECONDS}s budget"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
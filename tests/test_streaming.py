@@ -0,0 +1,192 @@
+import time
+import threading
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from app.main import app
+from app.core.config import settings
+from app.models.memory import memory_guard
+from app.models.ner_model import GLiNERModel
+
+
+class TestStreaming(unittest.TestCase):
+    """
+    Test cases for the WebSocket streaming endpoint
+    """
+
+    def setUp(self):
+        """
+        Set up test client and mock model
+        """
+        self.client = TestClient(app)
+
+        self.model_patcher = patch('app.api.endpoints.streaming.get_model')
+        self.mock_get_model = self.model_patcher.start()
+
+        self.mock_model = MagicMock(spec=GLiNERModel)
+        self.mock_model.predict.side_effect = lambda text, entity_type: [
+            {"text": text, "start": 0, "end": len(text), "entity_type": entity_type, "score": 0.9}
+        ]
+        self.mock_get_model.return_value = self.mock_model
+
+        self.headers = {"X-API-Key": settings.API_KEY}
+
+    def tearDown(self):
+        """
+        Clean up after tests
+        """
+        self.model_patcher.stop()
+
+    def test_stream_returns_tagged_results(self):
+        """
+        Test that each request gets a response tagged with its ID
+        """
+        with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+            websocket.send_json({"id": "a", "text": "Alice", "entity_type": "PERSON"})
+            websocket.send_json({"id": "b", "text": "Paris", "entity_type": "LOCATION"})
+
+            responses = {}
+            for _ in range(2):
+                response = websocket.receive_json()
+                responses[response["id"]] = response
+
+        self.assertEqual(responses["a"]["entities"][0]["text"], "Alice")
+        self.assertEqual(responses["b"]["entities"][0]["entity_type"], "LOCATION")
+        self.assertIn("processing_time", responses["a"])
+
+    def test_stream_multiple_entity_types(self):
+        """
+        Test that one message can request several entity types
+        """
+        with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+            websocket.send_json({"id": "a", "text": "Alice", "entity_types": ["PERSON", "LOCATION"]})
+            response = websocket.receive_json()
+
+        self.assertEqual(
+            [entity["entity_type"] for entity in response["entities"]],
+            ["PERSON", "LOCATION"]
+        )
+
+    def test_invalid_message_returns_error(self):
+        """
+        Test that an invalid message gets an error without closing the connection
+        """
+        with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+            websocket.send_json({"id": "bad", "text": ""})
+            error = websocket.receive_json()
+
+            websocket.send_json({"id": "good", "text": "Alice", "entity_type": "PERSON"})
+            response = websocket.receive_json()
+
+        self.assertEqual(error["id"], "bad")
+        self.assertIn("error", error)
+        self.assertEqual(response["id"], "good")
+
+    def test_non_json_message_returns_error(self):
+        """
+        Test that a non-JSON frame gets an error without closing the connection
+        """
+        with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+            websocket.send_text("not json")
+            error = websocket.receive_json()
+
+            websocket.send_json({"id": "good", "text": "Alice", "entity_type": "PERSON"})
+            response = websocket.receive_json()
+
+        self.assertIsNone(error["id"])
+        self.assertIn("Invalid JSON", error["error"])
+        self.assertEqual(response["id"], "good")
+
+    def test_inflight_limit_holds_back_messages(self):
+        """
+        Test that a message is not processed until the one in flight finishes
+        """
+        started = []
+        first_started = threading.Event()
+        release_first = threading.Event()
+
+        def predict(text, entity_type):
+            started.append(text)
+            if text == "Alice":
+                first_started.set()
+                release_first.wait(timeout=5)
+            return [{"text": text, "start": 0, "end": len(text), "entity_type": entity_type, "score": 0.9}]
+
+        self.mock_model.predict.side_effect = predict
+
+        with patch.object(settings, "WS_MAX_INFLIGHT", 1):
+            with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+                websocket.send_json({"id": "a", "text": "Alice", "entity_type": "PERSON"})
+                websocket.send_json({"id": "b", "text": "Paris", "entity_type": "LOCATION"})
+
+                self.assertTrue(first_started.wait(timeout=5))
+                time.sleep(0.2)
+                self.assertEqual(started, ["Alice"])
+
+                release_first.set()
+                responses = [websocket.receive_json()["id"] for _ in range(2)]
+
+        self.assertEqual(started, ["Alice", "Paris"])
+        self.assertEqual(responses, ["a", "b"])
+
+    def test_model_error_returns_error(self):
+        """
+        Test that model failures are reported per request
+        """
+        self.mock_model.predict.side_effect = RuntimeError("Model prediction failed")
+
+        with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+            websocket.send_json({"id": "a", "text": "Alice", "entity_type": "PERSON"})
+            response = websocket.receive_json()
+
+        self.assertEqual(response["id"], "a")
+        self.assertIn("Error during prediction", response["error"])
+
+    def test_draining_closes_connection(self):
+        """
+        Test that a connection is closed with 1012 once the worker starts draining
+        """
+        with patch.object(memory_guard, "threshold_mb", 1), \
+                patch.object(memory_guard, "_recycle") as mock_recycle, \
+                patch.object(memory_guard, "draining", False):
+            with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+                websocket.send_json({"id": "a", "text": "Alice", "entity_type": "PERSON"})
+                response = websocket.receive_json()
+
+                with self.assertRaises(WebSocketDisconnect) as context:
+                    websocket.receive_json()
+
+            self.assertTrue(memory_guard.draining)
+
+        self.assertEqual(response["id"], "a")
+        self.assertEqual(context.exception.code, 1012)
+        mock_recycle.assert_not_called()
+
+    def test_draining_refuses_new_connections(self):
+        """
+        Test that new connections are refused while the worker drains
+        """
+        with patch.object(memory_guard, "draining", True):
+            with self.assertRaises(WebSocketDisconnect) as context:
+                with self.client.websocket_connect("/api/v1/ws/predict", headers=self.headers) as websocket:
+                    websocket.receive_json()
+
+        self.assertEqual(context.exception.code, 1013)
+
+    def test_invalid_api_key_rejected(self):
+        """
+        Test that the handshake is rejected without a valid API key
+        """
+        with patch.object(settings, "API_KEY_ENABLED", True):
+            with self.assertRaises(WebSocketDisconnect):
+                with self.client.websocket_connect(
+                    "/api/v1/ws/predict", headers={"X-API-Key": "wrong"}
+                ) as websocket:
+                    websocket.receive_json()
+
+
+if __name__ == "__main__":
+    unittest.main()